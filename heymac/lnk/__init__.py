@@ -1,6 +1,6 @@
 from .heymac_hsm import HeymacCsmaHsm
 from .heymac_frame import HeymacFrame, HeymacFrameError, HeymacFrameFctl, \
-    HeymacFramePidIdent, HeymacFramePidType, \
+    HeymacFramePidIdent, HeymacFramePidType, HeymacFrameSlice, \
     HeymacIe, HeymacIeError, HeymacIeSequence, \
     HeymacHIeTerm, HeymacHIeSqncNmbr, HeymacHIeCipher, \
     HeymacPIeTerm, HeymacPIeFrag0, HeymacPIeFragN, HeymacPIeMic
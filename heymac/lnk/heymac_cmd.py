@@ -24,9 +24,15 @@ one Heymac frame.
 """
 
 from collections import namedtuple
+import itertools
+import operator
 import struct
 
 
+# Structs of whole variable-length commands, by (class, entry count)
+_ENTRIES_STRUCTS = {}
+
+
 class HeymacCmdError(Exception):
     pass
 
@@ -40,9 +46,50 @@ class HeymacCmd():
     PREFIX_MASK = 0b11000000
     CMD_MASK = 0b00111111
 
+    # Subclasses only add class attributes, so they declare empty slots
+    __slots__ = ("_fields",)
+
     _SUB_ID = None
     _FLDS_CLS = None
 
+    # Command classes by header octet (prefix | _CMD_ID), filled in
+    # as subclasses are defined.  The entry for a command ID that uses
+    # sub-IDs is a dict by _SUB_ID.
+    _CMD_CLASSES = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "_FLDS_CLS" in cls.__dict__:
+            cls._init_fld_attrs()
+        cmd_id = cls.__dict__.get("_CMD_ID")
+        if cmd_id is None or cmd_id < 0:
+            return
+        if cmd_id > HeymacCmd.CMD_MASK:
+            raise HeymacCmdError("Invalid _CMD_ID")
+
+        # The header octet(s) that start every serialized command:
+        # the prefix and command ID, then the sub-ID (if any)
+        hdr = HeymacCmd.PREFIX | cmd_id
+        if cls._SUB_ID:
+            sub_classes = HeymacCmd._CMD_CLASSES.setdefault(hdr, {})
+            if type(sub_classes) is not dict or cls._SUB_ID in sub_classes:
+                raise HeymacCmdError("Duplicate _CMD_ID/_SUB_ID")
+            sub_classes[cls._SUB_ID] = cls
+            cls._CMD_HDR = (hdr, cls._SUB_ID)
+        else:
+            if hdr in HeymacCmd._CMD_CLASSES:
+                raise HeymacCmdError("Duplicate _CMD_ID")
+            HeymacCmd._CMD_CLASSES[hdr] = cls
+            cls._CMD_HDR = (hdr,)
+        cls._CMD_HDR_BYTES = bytes(cls._CMD_HDR)
+
+        # The fields' struct, and one that also packs the header
+        # so a fixed-size command serializes in one call
+        if "_FMT_STR" in cls.__dict__:
+            cls._STRUCT = struct.Struct(cls._FMT_STR)
+            cls._CMD_STRUCT = struct.Struct(
+                "!" + "B" * len(cls._CMD_HDR) + cls._FMT_STR.lstrip("!"))
+
     def __init__(self, *args, **kwargs):
         if self._FLDS_CLS:
             try:
@@ -55,72 +102,74 @@ class HeymacCmd():
         else:
             self._fields = None
 
-    def __getattr__(self, attr):
-        return getattr(self._fields, attr)
-
     def __bytes__(self):
         """Serializes the command into bytes to send over the air."""
-        b = bytearray()
-        b.append(HeymacCmd.PREFIX | self._CMD_ID)
-        b.extend(struct.pack(self._FMT_STR, *self._fields))
-        return bytes(b)
+        return self._CMD_STRUCT.pack(*self._CMD_HDR, *self._fields)
 
     @staticmethod
     def parse(cmd_bytes):
         """Parses the serialized cmd_bytes into a HeymacCommand subclass."""
-        if len(cmd_bytes) < 1:
+        if not cmd_bytes:
             raise HeymacCmdError("Insufficient data")
 
+        # Each kind of command parses itself
         cmd_cls = HeymacCmd._get_cmd_class(cmd_bytes)
+        return cmd_cls._parse(cmd_bytes)
 
-        if issubclass(cmd_cls, HeymacCmdUnknown):
-            cmd = HeymacCmdUnknown(cmd_bytes)
-        else:
-            if cmd_cls._SUB_ID:
-                offset = 2
-            else:
-                offset = 1
-
-            if issubclass(cmd_cls, HeymacCmdVarLen):
-                n_entries = cmd_bytes[offset]
-                offset += 1
-                entries = list(struct.iter_unpack(cmd_cls._FMT_STR, cmd_bytes[offset:]))
-                assert n_entries == len(entries)
-                cmd = cmd_cls(entries)
-            else:
-                n_entries = 1
-                cmd = cmd_cls(*struct.unpack(cmd_cls._FMT_STR, cmd_bytes[offset:]))
-        return cmd
+    @classmethod
+    def _init_fld_attrs(cls):
+        """Makes each field readable as an attribute of the command.
+
+        Each field gets a property that reads it straight out of the
+        namedtuple, unless the class already defines that name.
+        """
+        for fld_name in cls._FLDS_CLS._fields:
+            if fld_name not in cls.__dict__:
+                setattr(cls, fld_name, property(
+                    operator.attrgetter("_fields." + fld_name)))
 
     @staticmethod
     def _get_cmd_class(cmd_bytes):
-        all_cmd_classes = HeymacCmd.__subclasses__()
-        all_cmd_classes.extend(HeymacCmdVarLen.__subclasses__())
-        for cmd_cls in all_cmd_classes:
-            if cmd_cls._CMD_ID > HeymacCmd.CMD_MASK:
-                raise HeymacCmdError("Invalid _CMD_ID")
-            if (HeymacCmd.PREFIX | cmd_cls._CMD_ID) == cmd_bytes[0]:
-                if cmd_cls._SUB_ID:
-                    if cmd_bytes[1] == cmd_cls._SUB_ID:
-                        break
-                else:
-                    break
-        else:
-            cmd_cls = HeymacCmdUnknown
-        return cmd_cls
+        # Classes are keyed by the whole header octet, so a foreign
+        # prefix simply isn't found
+        entry = HeymacCmd._CMD_CLASSES.get(cmd_bytes[0])
+        if type(entry) is dict:
+            if len(cmd_bytes) > 1:
+                entry = entry.get(cmd_bytes[1])
+            else:
+                entry = None
+        return entry or HeymacCmdUnknown
+
+    @classmethod
+    def _parse(cls, cmd_bytes):
+        """Parses cmd_bytes as a fixed-size command of this class."""
+        if len(cmd_bytes) != cls._CMD_STRUCT.size:
+            raise HeymacCmdError("Invalid command size")
+        # Unpack in place rather than copying the body out first.
+        # The values came from the class struct, so skip __init__'s checks.
+        cmd = cls.__new__(cls)
+        cmd._fields = cls._FLDS_CLS._make(
+            cls._STRUCT.unpack_from(cmd_bytes, len(cls._CMD_HDR)))
+        return cmd
 
 
 class HeymacCmdUnknown():
     """An unknown Heymac Command."""
+    __slots__ = ("cmd_bytes",)
     _CMD_ID = 0
 
     def __init__(self, cmd_bytes):
         self.cmd_bytes = cmd_bytes
 
+    @classmethod
+    def _parse(cls, cmd_bytes):
+        return cls(cmd_bytes)
+
 
 # TODO: create unit tests
 class HeymacCmdVarLen(HeymacCmd):
     """A Heymac Command whose payload is variable-length, a sequence of entries."""
+    __slots__ = ()
     _CMD_ID = -1
 
     def __init__(self, *args, **kwargs):
@@ -137,11 +186,10 @@ class HeymacCmdVarLen(HeymacCmd):
 
     def __bytes__(self):
         """Serializes the command into bytes to send over the air."""
-        b = bytearray()
-        b.append(HeymacCmd.PREFIX | self._CMD_ID)
-        b.append(len(self._fields))
-        [b.extend(struct.pack(self._FMT_STR, *f)) for f in self._fields]
-        return bytes(b)
+        n_entries = len(self._fields)
+        return self._entries_struct(n_entries).pack(
+            *self._CMD_HDR, n_entries,
+            *itertools.chain.from_iterable(self._fields))
 
     def __getitem__(self, idx):
         return self._fields[idx]
@@ -157,71 +205,139 @@ class HeymacCmdVarLen(HeymacCmd):
         named_flds = self._FLDS_CLS(**flds)
         self._fields.append(named_flds)
 
+    @classmethod
+    def _init_fld_attrs(cls):
+        # Entries are reached by index, so there are no field attributes
+        pass
+
+    @classmethod
+    def _parse(cls, cmd_bytes):
+        """Parses cmd_bytes as a variable-length command of this class."""
+        offset = len(cls._CMD_HDR)
+        if len(cmd_bytes) <= offset:
+            raise HeymacCmdError("Insufficient data")
+        n_entries = cmd_bytes[offset]
+        offset += 1
+        # The entry count must account for the rest of the bytes
+        if len(cmd_bytes) - offset != n_entries * cls._STRUCT.size:
+            raise HeymacCmdError("Invalid number of entries")
+        # Each unpacked (field, ...) row becomes one entry
+        cmd = cls.__new__(cls)
+        cmd._fields = list(map(
+            cls._FLDS_CLS._make, cls._STRUCT.iter_unpack(cmd_bytes[offset:])))
+        return cmd
 
-class HeymacCmdTxt(HeymacCmdVarLen):
-    """Heymac command text message: {1, msg_len, msg}"""
+    @classmethod
+    def _entries_struct(cls, n_entries):
+        """Returns the struct for the whole command with n_entries."""
+        key = (cls, n_entries)
+        s = _ENTRIES_STRUCTS.get(key)
+        if not s:
+            s = struct.Struct("!" + "B" * len(cls._CMD_HDR) + "B"
+                              + cls._FMT_STR.lstrip("!") * n_entries)
+            _ENTRIES_STRUCTS[key] = s
+        return s
+
+
+class HeymacCmdTxt(HeymacCmd):
+    """Heymac command text message: {1, msg}
+
+    The message fills the rest of the command,
+    so it has neither a struct format nor a length field.
+    """
+    __slots__ = ()
     _CMD_ID = 1
-    _FMT_STR = "!c"
     _FLDS_CLS = namedtuple("CmdTxt", ["msg"])
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Convert once here so serializing is a plain concatenation
+        if type(self._fields.msg) is not bytes:
+            self._fields = self._FLDS_CLS(bytes(self._fields.msg))
+
     def __bytes__(self):
         """Serializes the command into bytes to send over the air."""
-        b = bytearray()
-        b.append(HeymacCmd.PREFIX | self._CMD_ID)
-        msg_bytes = self._fields[0].msg
-        msg_len = len(msg_bytes)
-        assert msg_len < 256
-        b.append(msg_len)
-        b.extend(msg_bytes)
-        return bytes(b)
+        return self._CMD_HDR_BYTES + self._fields.msg
+
+    @classmethod
+    def _parse(cls, cmd_bytes):
+        cmd = cls.__new__(cls)
+        cmd._fields = cls._FLDS_CLS(bytes(cmd_bytes[len(cls._CMD_HDR):]))
+        return cmd
 
 
 class HeymacCmdBcn(HeymacCmd):
     """Heymac command beacon: {2, caps, status, callsign_ssid, pub_key}"""
+    __slots__ = ()
     _CMD_ID = 2
     _FMT_STR = "!HH16s96s"
     _FLDS_CLS = namedtuple("CmdBcn", ["caps", "status", "callsign_ssid", "pub_key"])
 
-    # Fix callsign_ssid: remove null padding and convert to a string
-    def __getattr__(self, attr):
-        retval = getattr(self._fields, attr)
-        if attr == "callsign_ssid":
-            retval = retval.rstrip(b"\x00")
-        return retval
+    # Fix callsign_ssid: remove null padding
+    @property
+    def callsign_ssid(self):
+        return self._fields.callsign_ssid.rstrip(b"\x00")
 
 
 class HeymacCmdNgbrData(HeymacCmdVarLen):
     """Heymac neighbor data: {4, ngbr_cnt, (ngbr_lnk_addr)..}"""
+    __slots__ = ()
     _CMD_ID = 4
     _FMT_STR = "!8s"
     _FLDS_CLS = namedtuple("CmdNgbrData", ["ngbr_lnk_addr"])
 
 
-class HeymacCmdJoinRqst(HeymacCmd):
+class HeymacCmdJoin(HeymacCmd):
+    """The Heymac join commands: {5, sub_id, ...}
+
+    The join commands share one command ID and are distinguished
+    by the sub-ID.  Each subclass only declares its sub-ID and fields.
+    """
+    __slots__ = ()
+
+    def __bytes__(self):
+        """Returns the join command as bytes.
+
+        Every join field is a big-endian u16, so this appends each
+        one to the header without a trip through struct.
+        """
+        b = self._CMD_HDR_BYTES
+        for v in self._fields:
+            b += v.to_bytes(2, "big")
+        return b
+
+
+class HeymacCmdJoinRqst(HeymacCmdJoin):
     """Heymac join-request: {5, 1, net_id}"""
+    __slots__ = ()
     _CMD_ID = 5
     _SUB_ID = 1
     _FMT_STR = "!H"
     _FLDS_CLS = namedtuple("CmdJoinRqst", ["net_id"])
 
 
-class HeymacCmdJoinAcpt(HeymacCmd):
+class HeymacCmdJoinAcpt(HeymacCmdJoin):
     """Heymac join-accept: {5, 2, net_id, net_addr}"""
+    __slots__ = ()
     _CMD_ID = 5
     _SUB_ID = 2
     _FMT_STR = "!HH"
     _FLDS_CLS = namedtuple("CmdJoinAcpt", ["net_id", "net_addr"])
 
 
-class HeymacCmdJoinCnfm(HeymacCmd):
+class HeymacCmdJoinCnfm(HeymacCmdJoin):
     """Heymac join-confirm: {5, 3, net_id, net_addr}"""
+    __slots__ = ()
     _CMD_ID = 5
     _SUB_ID = 3
     _FMT_STR = "!HH"
     _FLDS_CLS = namedtuple("CmdJoinCnfm", ["net_id", "net_addr"])
 
 
-class HeymacCmdJoinRjct(HeymacCmd):
+class HeymacCmdJoinRjct(HeymacCmdJoin):
     """Heymac join-reject: {5, 4}"""
+    __slots__ = ()
     _CMD_ID = 5
     _SUB_ID = 4
+    _FMT_STR = "!"
+    _FLDS_CLS = namedtuple("CmdJoinRjct", [])
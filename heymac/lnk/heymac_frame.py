@@ -5,10 +5,11 @@ Link-layer Heymac frame parsing, building and serializing.
 """
 
 import enum
+import operator
 import struct
 
-from heymac.lnk.heymac_cmd import HeymacCmd
-from heymac.net.apv6_pkt import APv6Packet
+from heymac.lnk.heymac_cmd import HeymacCmd, HeymacCmdError
+from heymac.net.apv6_pkt import APv6Packet, APv6PacketError, UdpDatagramError
 
 
 class HeymacFrameError(Exception):
@@ -94,6 +95,10 @@ class HeymacFrame():
         frame = HeymacFrame.parse(phy_payld)
         # TODO: demo frame properties
 
+    bytes(frame) keeps the serialized frame until a field is set
+    through its property.  If a payload object is modified in place
+    after the frame is serialized, set frame.payld again.
+
     When working with field values, the data type is
     either a number 0..255 for single-byte fields
     or a bytearray() or bytes() object for multi-byte fields.
@@ -106,13 +111,19 @@ class HeymacFrame():
     FIELD_NAMES = (
         "netid", "daddr", "ies", "saddr", "payld", "mic", "taddr")
 
+    # cmd and rx_* are set by the link layer on received frames
+    __slots__ = ("_pid", "_fctl", "_netid", "_daddr", "_ie_sqnc", "_saddr",
+                 "_payld", "_mic", "_taddr", "_frame_bytes",
+                 "cmd", "rx_time", "rx_rssi", "rx_snr")
+
     def __init__(self, pid_type, **kwargs):
         """Creates a HeymacFrame starting with the given PID and Fctl."""
-        if (pid_type & ~HeymacFramePidType.MASK) != 0:
+        pid_type = operator.index(pid_type)
+        if pid_type & ~HeymacFrame._PID_TYPE_MASK:
             raise HeymacFrameError("invalid pid_type value")
 
-        self._pid = HeymacFramePidIdent.HEYMAC | pid_type
-        self._fctl = HeymacFrameFctl.NO_FLAGS
+        self._pid = HeymacFrame._PID_HEYMAC | pid_type
+        self._fctl = 0
         self._netid = None
         self._daddr = None
         self._ie_sqnc = None
@@ -120,153 +131,167 @@ class HeymacFrame():
         self._payld = None
         self._mic = None
         self._taddr = None
+        self._frame_bytes = None
+        self.cmd = None
+        self.rx_time = None
+        self.rx_rssi = None
+        self.rx_snr = None
 
         for k, v in kwargs.items():
-            if k not in HeymacFrame.FIELD_NAMES:
+            setter = HeymacFrame._FIELD_SETTERS.get(k)
+            if not setter:
                 raise HeymacFrameError("Invalid field, {}".format(k))
-            setattr(self, k, v)
+            setter(self, v)
 
         # TODO: find a way to set the Fctl.P bit
 
     def __bytes__(self):
         """Returns the HeymacFrame serialized into a bytes object.
 
+        The serialized frame is kept and returned by later calls
+        until a field is set.
+
         Raises a HeymacFrameError if some bits or fields
         are not set properly.
         """
-        self._validate_fctl_and_fields()
+        if self._frame_bytes is not None:
+            return self._frame_bytes
 
-        frame = bytearray()
-        frame.append(self._pid)
-        frame.append(self._fctl)
+        self._validate_fctl_and_fields()
 
-        if self.is_extended():
-            if self._payld:
-                frame.extend(self._payld)
-        else:
-            if self.is_netid_present():
-                frame.extend(self._netid)
-            if self.is_daddr_present():
-                frame.extend(self._daddr)
-            if self.is_ies_present():
-                frame.extend(self.ies)
-            if self.is_saddr_present():
-                frame.extend(self._saddr)
-            if self._payld:
-                if type(self._payld) is not bytes:
-                    b = bytes(self._payld)
-                else:
-                    b = self._payld
-                frame.extend(b)
-            # TODO: add MICs
-            if self.is_mhop():
-                frame.extend(self._taddr)
+        payld = self._payld
+        if payld and type(payld) is not bytes:
+            payld = bytes(payld)
 
+        # Serialize with the packer made for this Fctl's layout
+        fctl = self._fctl
+        packer = HeymacFrame._PACKERS.get(fctl)
+        if not packer:
+            packer = HeymacFrame._make_packer(fctl)
+        frame = packer(self, payld)
         if len(frame) > HeymacFrame.MAX_LEN:
             raise HeymacFrameError("Serialized frame is too large.")
-        return bytes(frame)
+        self._frame_bytes = frame
+        return frame
 
     @staticmethod
     def parse(frame_bytes):
         """Parses the given frame_bytes and returns a HeymacFrame.
 
+        frame_bytes may be bytes, any other object that supports
+        the buffer protocol, or a sequence of ints (as the PHY gives).
+        It is converted to bytes once so every field is a bytes slice.
+
         Raises a HeymacFrameError if some bits or fields
         are not set properly.
         """
-        if max(frame_bytes) > 255 or min(frame_bytes) < 0:
-            raise HeymacFrameError("frame_bytes must be a sequence of bytes")
-        if len(frame_bytes) < HeymacFrame.MIN_LEN:
+        if type(frame_bytes) is not bytes:
+            try:
+                frame_bytes = bytes(frame_bytes)
+            except (TypeError, ValueError):
+                raise HeymacFrameError(
+                    "frame_bytes must be a sequence of bytes")
+        frame_sz = len(frame_bytes)
+        if frame_sz < HeymacFrame.MIN_LEN:
             raise HeymacFrameError("Frame must be 2 or more bytes in length")
 
-        pid_ident = frame_bytes[0] & HeymacFramePidIdent.MASK
-        if pid_ident != HeymacFramePidIdent.HEYMAC:
+        # One lookup both validates the PID ident and extracts the type
+        pid_type = HeymacFrame._PID_TYPES[frame_bytes[0]]
+        if pid_type is None:
             raise HeymacFrameError("Invalid PID ident")
-
-        pid_type = frame_bytes[0] & HeymacFramePidType.MASK
         frame = HeymacFrame(pid_type)
 
+        # Fields are assigned directly (not via the property setters)
+        # because this is on the rx path of every frame
         fctl = frame_bytes[1]
-        addr_sz = (2, 8)[(fctl & HeymacFrameFctl.L) != 0]
+        frame._fctl = fctl
         offset = 2
 
         # The format of Extended frame is not defined by Heymac
         # so everything after PID, Fctl is payload
-        if fctl & HeymacFrameFctl.X:
-            frame.payld = frame_bytes[offset:]
-            offset = len(frame_bytes)
+        if fctl & HeymacFrame._FCTL_X:
+            frame._payld = frame_bytes[offset:]
+            offset = frame_sz
 
-        # Parse a regular Heymac frame
+        # Parse a regular Heymac frame using the field layout for its Fctl
         else:
-            if fctl & HeymacFrameFctl.N:
-                frame.netid = frame_bytes[offset:offset + 2]
-                offset += 2
-
-            if fctl & HeymacFrameFctl.D:
-                frame.daddr = frame_bytes[offset:offset + addr_sz]
-                offset += addr_sz
-
-            if fctl & HeymacFrameFctl.I:
-                ies = HeymacIeSequence.parse(frame_bytes, offset)
-                frame.ies = ies
-                offset += len(ies)
-
-            if fctl & HeymacFrameFctl.S:
-                frame.saddr = frame_bytes[offset:offset + addr_sz]
-                offset += addr_sz
+            head_flds, mhop_sz = HeymacFrame._PARSE_LAYOUTS[fctl]
+            for fld_nm, sz in head_flds:
+                if sz:
+                    setattr(frame, fld_nm, frame_bytes[offset:offset + sz])
+                    offset += sz
+                else:
+                    ies = HeymacIeSequence.parse(frame_bytes, offset)
+                    frame._ie_sqnc = ies
+                    offset += len(ies)
 
             # Determine the size of the items at the tail
             # of the frame in order to parse the payload
             # TODO: determine MIC size from IEs
             mic_sz = 0
 
-            if fctl & HeymacFrameFctl.M:
-                mhop_sz = addr_sz
-            else:
-                mhop_sz = 0
-
-            payld_sz = len(frame_bytes) - offset - mic_sz - mhop_sz
-            frame.payld = HeymacFrame._parse_payld(frame_bytes,
-                                                   offset,
-                                                   payld_sz)
+            payld_sz = frame_sz - offset - mic_sz - mhop_sz
+            frame._payld = HeymacFrame._parse_payld(frame_bytes,
+                                                    offset,
+                                                    payld_sz)
             offset += payld_sz
 
             # TODO: parse MIC
 
-            if fctl & HeymacFrameFctl.M:
-                frame.taddr = frame_bytes[offset:offset + addr_sz]
-                offset += addr_sz
+            if mhop_sz:
+                frame._taddr = frame_bytes[offset:offset + mhop_sz]
+                offset += mhop_sz
 
-        if offset != len(frame_bytes):
+        if offset != frame_sz:
             raise HeymacFrameError("frame_bytes does not make an exact frame")
 
-        frame._validate_fctl_and_fields()
+        # A regular frame's layout guarantees that a field is present
+        # if and only if its Fctl bit is set and that the addresses
+        # are the same size, so only the Fctl.L check remains.
+        # Extended frames get the full validation.
+        if fctl & HeymacFrame._FCTL_X:
+            frame._validate_fctl_and_fields()
+        elif (fctl & HeymacFrame._FCTL_L
+                and not fctl & HeymacFrame._ADDR_FLDS_MASK):
+            raise HeymacFrameError(
+                "Long address selected, but no address field is present")
+        frame._frame_bytes = frame_bytes
         return frame
 
 
+    @staticmethod
+    def parse_many(buf, starts):
+        """Parses the frames packed back-to-back in buf.
+
+        starts is an ascending sequence of the offset in buf
+        where each frame begins; each frame ends where the next
+        one begins or, for the last frame, at the end of buf.
+        Returns a list of HeymacFrames.
+
+        Raises a HeymacFrameError if any frame is invalid.
+        """
+        mv = memoryview(buf)
+        ends = list(starts[1:])
+        ends.append(len(mv))
+        parse = HeymacFrame.parse
+        return [parse(mv[start:end]) for start, end in zip(starts, ends)]
+
+
     def available_payld_sz(self):
         byte_cnt = 2   # PID + Fctl
-        if not self.is_extended():
-            if self.is_netid_present():
-                byte_cnt += 2
-            if self.is_long_addrs():
-                addr_len = 8
-            else:
-                addr_len = 2
-            if self.is_daddr_present():
-                byte_cnt += addr_len
-            if self.is_ies_present():
+        fctl = self._fctl
+        if not fctl & HeymacFrame._FCTL_X:
+            # The fixed-size fields' total is precomputed for each Fctl
+            byte_cnt += HeymacFrame._FIXED_FLDS_SZS[fctl]
+            if fctl & HeymacFrame._FCTL_I:
                 byte_cnt += len(self._ie_sqnc)
-            if self.is_saddr_present():
-                byte_cnt += addr_len
             # TODO: add MICs
-            if self.is_mhop():
-                byte_cnt += addr_len
         return 255 - byte_cnt
 
 
     def get_sender(self):
         """Returns the sender of the frame (source or re-transmitter)."""
-        if self.is_mhop():
+        if self._fctl & HeymacFrame._MHOP_MASK == HeymacFrame._FCTL_M:
             sender = self._taddr
         else:
             sender = self._saddr
@@ -278,35 +303,36 @@ class HeymacFrame():
         Note, this only checks the first four bits and does not check
         the rest of the frame for validity.
         """
-        return (self._pid & HeymacFramePidIdent.MASK
-                == HeymacFramePidIdent.HEYMAC)
+        return (self._pid & HeymacFrame._PID_IDENT_MASK
+                == HeymacFrame._PID_HEYMAC)
 
     def is_extended(self):
-        return 0 != (self._fctl & HeymacFrameFctl.X)
+        return 0 != (self._fctl & HeymacFrame._FCTL_X)
 
     def _is_fctl_bit_set(self, bit_mask):
-        return not self.is_extended() and 0 != (self._fctl & bit_mask)
+        # The bit is only meaningful if Fctl.X is clear
+        return self._fctl & (HeymacFrame._FCTL_X | bit_mask) == bit_mask
 
     def is_long_addrs(self):
-        return self._is_fctl_bit_set(HeymacFrameFctl.L)
+        return self._is_fctl_bit_set(HeymacFrame._FCTL_L)
 
     def is_netid_present(self):
-        return self._is_fctl_bit_set(HeymacFrameFctl.N)
+        return self._is_fctl_bit_set(HeymacFrame._FCTL_N)
 
     def is_daddr_present(self):
-        return self._is_fctl_bit_set(HeymacFrameFctl.D)
+        return self._is_fctl_bit_set(HeymacFrame._FCTL_D)
 
     def is_ies_present(self):
-        return self._is_fctl_bit_set(HeymacFrameFctl.I)
+        return self._is_fctl_bit_set(HeymacFrame._FCTL_I)
 
     def is_saddr_present(self):
-        return self._is_fctl_bit_set(HeymacFrameFctl.S)
+        return self._is_fctl_bit_set(HeymacFrame._FCTL_S)
 
     def is_mhop(self):
-        return self._is_fctl_bit_set(HeymacFrameFctl.M)
+        return self._is_fctl_bit_set(HeymacFrame._FCTL_M)
 
     def is_pending_set(self):
-        return self._is_fctl_bit_set(HeymacFrameFctl.P)
+        return self._is_fctl_bit_set(HeymacFrame._FCTL_P)
 
     @property
     def pid(self):
@@ -323,7 +349,8 @@ class HeymacFrame():
     @netid.setter
     def netid(self, val):
         self._netid = val
-        self._fctl |= HeymacFrameFctl.N
+        self._frame_bytes = None
+        self._fctl |= HeymacFrame._FCTL_N
 
     @property
     def daddr(self):
@@ -332,9 +359,10 @@ class HeymacFrame():
     @daddr.setter
     def daddr(self, val):
         self._daddr = val
-        self._fctl |= HeymacFrameFctl.D
+        self._frame_bytes = None
+        self._fctl |= HeymacFrame._FCTL_D
         if len(val) > 2:
-            self._fctl |= HeymacFrameFctl.L
+            self._fctl |= HeymacFrame._FCTL_L
 
     @property
     def ies(self):
@@ -343,7 +371,8 @@ class HeymacFrame():
     @ies.setter
     def ies(self, val):
         self._ie_sqnc = val
-        self._fctl |= HeymacFrameFctl.I
+        self._frame_bytes = None
+        self._fctl |= HeymacFrame._FCTL_I
 
     @property
     def saddr(self):
@@ -352,9 +381,10 @@ class HeymacFrame():
     @saddr.setter
     def saddr(self, val):
         self._saddr = val
-        self._fctl |= HeymacFrameFctl.S
+        self._frame_bytes = None
+        self._fctl |= HeymacFrame._FCTL_S
         if len(val) > 2:
-            self._fctl |= HeymacFrameFctl.L
+            self._fctl |= HeymacFrame._FCTL_L
 
     @property
     def payld(self):
@@ -363,6 +393,17 @@ class HeymacFrame():
     @payld.setter
     def payld(self, val):
         self._payld = val
+        self._frame_bytes = None
+
+    @property
+    def mic(self):
+        return self._mic
+
+    @mic.setter
+    def mic(self, val):
+        # TODO: add MICs
+        self._mic = val
+        self._frame_bytes = None
 
     @property
     def taddr(self):
@@ -371,7 +412,8 @@ class HeymacFrame():
     @taddr.setter
     def taddr(self, val):
         self._taddr = val
-        self._fctl |= HeymacFrameFctl.M
+        self._frame_bytes = None
+        self._fctl |= HeymacFrame._FCTL_M
 
 
 # Private
@@ -379,26 +421,134 @@ class HeymacFrame():
     # TODO: verify CSMA version
     # _SUPPORTED_CSMA_VRSNS = (0,)
 
+    # The setter for each of FIELD_NAMES, used to apply __init__'s kwargs
+    _FIELD_SETTERS = {
+        "netid": netid.fset,
+        "daddr": daddr.fset,
+        "ies": ies.fset,
+        "saddr": saddr.fset,
+        "payld": payld.fset,
+        "mic": mic.fset,
+        "taddr": taddr.fset,
+    }
+
+    # PID and Fctl masks as plain ints, which are much quicker
+    # to operate on than the IntFlag members
+    _PID_IDENT_MASK = int(HeymacFramePidIdent.MASK)
+    _PID_HEYMAC = int(HeymacFramePidIdent.HEYMAC)
+    _PID_TYPE_MASK = int(HeymacFramePidType.MASK)
+    _FCTL_X = int(HeymacFrameFctl.X)
+    _FCTL_L = int(HeymacFrameFctl.L)
+    _FCTL_N = int(HeymacFrameFctl.N)
+    _FCTL_D = int(HeymacFrameFctl.D)
+    _FCTL_I = int(HeymacFrameFctl.I)
+    _FCTL_S = int(HeymacFrameFctl.S)
+    _FCTL_M = int(HeymacFrameFctl.M)
+    _FCTL_P = int(HeymacFrameFctl.P)
+
+    # Fctl bits that make a regular frame multi-hop
+    _MHOP_MASK = _FCTL_X | _FCTL_M
+    # Fctl bits of the address fields
+    _ADDR_FLDS_MASK = _FCTL_D | _FCTL_S | _FCTL_M
+
+    # PID and Fctl
+    _HDR_STRUCT = struct.Struct("BB")
+
+    # Serializing functions made by _make_packer(), by Fctl
+    _PACKERS = {}
+
+    # The Fctl bit that indicates the presence of each optional field
+    _FCTL_FIELDS = ((_FCTL_N, "_netid"),
+                    (_FCTL_D, "_daddr"),
+                    (_FCTL_I, "_ie_sqnc"),
+                    (_FCTL_S, "_saddr"),
+                    (_FCTL_M, "_taddr"))
+
+    # Fetches all of the fields above in one call
+    _get_fctl_fields = operator.attrgetter(
+        *(field_nm for _, field_nm in _FCTL_FIELDS))
+
+    # The Fctl bits of all of the fields above
+    _FLDS_BITS_MASK = _FCTL_N | _FCTL_D | _FCTL_I | _FCTL_S | _FCTL_M
+
+    @staticmethod
+    def _make_packer(fctl):
+        """Makes and keeps a function that serializes frames with this Fctl.
+
+        The function's source is generated so that it only joins
+        the fields present for this Fctl, with no bit tests.
+        It takes the frame and its payload's bytes (or None)
+        and returns the frame's bytes.
+        """
+        flds = ["_hdr_pack(f._pid, f._fctl)"]
+        if fctl & HeymacFrame._FCTL_X:
+            flds.append("payld or b''")
+        else:
+            # The fields are in the same order as they are parsed
+            head_flds, mhop_sz = HeymacFrame._PARSE_LAYOUTS[fctl]
+            for fld_nm, sz in head_flds:
+                if sz:
+                    flds.append("f." + fld_nm)
+                else:
+                    flds.append("bytes(f._ie_sqnc)")
+            flds.append("payld or b''")
+            # TODO: add MICs
+            if mhop_sz:
+                flds.append("f._taddr")
+        src = "def pack(f, payld):\n    return b''.join(({},))\n" \
+              .format(", ".join(flds))
+        namespace = {"_hdr_pack": HeymacFrame._HDR_STRUCT.pack}
+        exec(src, namespace)
+        packer = namespace["pack"]
+        HeymacFrame._PACKERS[fctl] = packer
+        return packer
+
+    @staticmethod
+    def _parse_layout(fctl):
+        """Returns the layout of a regular frame with the given Fctl.
+
+        The layout is a tuple of the fields ahead of the payload,
+        in frame order, as (attribute name, size) pairs,
+        where a size of zero means the variable-sized IEs;
+        and the size of the re-transmitter address, or zero.
+        """
+        addr_sz = 8 if fctl & HeymacFrame._FCTL_L else 2
+        head_flds = []
+        if fctl & HeymacFrame._FCTL_N:
+            head_flds.append(("_netid", 2))
+        if fctl & HeymacFrame._FCTL_D:
+            head_flds.append(("_daddr", addr_sz))
+        if fctl & HeymacFrame._FCTL_I:
+            head_flds.append(("_ie_sqnc", 0))
+        if fctl & HeymacFrame._FCTL_S:
+            head_flds.append(("_saddr", addr_sz))
+        mhop_sz = addr_sz if fctl & HeymacFrame._FCTL_M else 0
+        return (tuple(head_flds), mhop_sz)
+
 
     @staticmethod
     def _parse_payld(frame_bytes, offset, sz):
         """Parses sz number of frame_bytes at the offset as the payload.
 
-        Returns a HeymacCmd object, an APv6Packet object or None
+        Returns a HeymacCmd object, an APv6Packet object or None.
+        Raises a HeymacFrameError if the payload does not parse.
         """
         if sz < 0:
             raise HeymacFrameError("Insufficient bytes")
         payld = None
         if sz > 0:
             first_byte = frame_bytes[offset]
-            if ((first_byte & APv6Packet.IPHC_PREFIX_MASK)
-                    == APv6Packet.IPHC_PREFIX):
-                payld = APv6Packet.parse(frame_bytes[offset:offset + sz])
-            elif ((first_byte & HeymacCmd.PREFIX_MASK)
-                    == HeymacCmd.PREFIX):
-                payld = HeymacCmd.parse(frame_bytes[offset:offset + sz])
-            else:
-                raise HeymacFrameError("Unknown payload prefix")
+            try:
+                if ((first_byte & APv6Packet.IPHC_PREFIX_MASK)
+                        == APv6Packet.IPHC_PREFIX):
+                    payld = APv6Packet.parse(frame_bytes[offset:offset + sz])
+                elif ((first_byte & HeymacCmd.PREFIX_MASK)
+                        == HeymacCmd.PREFIX):
+                    payld = HeymacCmd.parse(frame_bytes[offset:offset + sz])
+                else:
+                    raise HeymacFrameError("Unknown payload prefix")
+            except (HeymacCmdError, APv6PacketError, UdpDatagramError) as e:
+                raise HeymacFrameError("Invalid payload: {}".format(e)) from e
         return payld
 
 
@@ -408,65 +558,209 @@ class HeymacFrame():
         Always returns None.  Raises a HeymacFrameError if
         Fctl bits indicate a field is needed, but it's not present;
         or a field is present, but the Fctl bit is not set.
+        Raises at the first problem found.
         """
-        FIELD_INFO = ((HeymacFrameFctl.N, "_netid"),
-                      (HeymacFrameFctl.D, "_daddr"),
-                      (HeymacFrameFctl.I, "_ie_sqnc"),
-                      (HeymacFrameFctl.S, "_saddr"),
-                      (HeymacFrameFctl.M, "_taddr"))
-
-        err_msg = None
-        if not err_msg and (self._pid & HeymacFramePidIdent.MASK
-                            != HeymacFramePidIdent.HEYMAC):
-            err_msg = "PID value is not Heymac"
-        if not err_msg and 0 > self._fctl > 255:
-            err_msg = "Fctl value is invalid"
-
-        # Check that if the bit is set in Fctl,
-        # the data field exists and vice versa
-        if not err_msg:
-            fctl = self._fctl
-            for bit, field_nm in FIELD_INFO:
-                field = getattr(self, field_nm)
-                if (bit & fctl and not field) or ((bit & fctl) == 0 and field):
-                    err_msg = "Fctl bit/value missing for Fctl bit 0x{:x} " \
-                              "and field '{}'".format(bit, field_nm)
-                    break
+        if (self._pid & HeymacFrame._PID_IDENT_MASK
+                != HeymacFrame._PID_HEYMAC):
+            raise HeymacFrameError("PID value is not Heymac")
+        fctl = self._fctl
+        if not 0 <= fctl <= 255:
+            raise HeymacFrameError("Fctl value is invalid")
+
+        # Compare the Fctl bits of the fields that are present
+        # to the Fctl bits that are set, all at once.
+        # Only look for the culprit when they differ.
+        present = ((HeymacFrame._FCTL_N if self._netid else 0)
+                   | (HeymacFrame._FCTL_D if self._daddr else 0)
+                   | (HeymacFrame._FCTL_I if self._ie_sqnc else 0)
+                   | (HeymacFrame._FCTL_S if self._saddr else 0)
+                   | (HeymacFrame._FCTL_M if self._taddr else 0))
+        if (present != fctl & HeymacFrame._FLDS_BITS_MASK
+                or present and fctl & HeymacFrame._FCTL_X):
+            flds = HeymacFrame._get_fctl_fields(self)
+
+            # Check that if the bit is set in Fctl,
+            # the data field exists and vice versa
+            for (bit, field_nm), field in zip(HeymacFrame._FCTL_FIELDS, flds):
+                if bool(fctl & bit) != bool(field):
+                    raise HeymacFrameError(
+                        "Fctl bit/value missing for Fctl bit 0x{:x} "
+                        "and field '{}'".format(bit, field_nm))
+
+            # If Fctl.X is set, only the payload should exist
+            for (_, field_nm), field in zip(HeymacFrame._FCTL_FIELDS, flds):
+                if field:
+                    raise HeymacFrameError(
+                        "Extended frame has field other than {}"
+                        .format(field_nm))
 
         # Check that all address fields (if they exist) are the same length
-        addr_len = 0
-        if self._daddr:
-            addr_len = len(self.daddr)
-        if self._saddr and addr_len > 0 and addr_len != len(self.saddr):
-            err_msg = "Src and Dst address not of equal length"
-        if (not err_msg
-                and self._taddr
-                and addr_len > 0
-                and addr_len != len(self.taddr)):
-            err_msg = "Re-transmit address not of length equal to other(s)"
+        daddr = self._daddr
+        saddr = self._saddr
+        taddr = self._taddr
+        if daddr:
+            addr_len = len(daddr)
+            if saddr and addr_len != len(saddr):
+                raise HeymacFrameError(
+                    "Src and Dst address not of equal length")
+            if taddr and addr_len != len(taddr):
+                raise HeymacFrameError(
+                    "Re-transmit address not of length equal to other(s)")
 
         # If Fctl.L is set, at least one address field must exist
-        if not err_msg and (bool(fctl & HeymacFrameFctl.L)
-                            and not self._daddr
-                            and not self._saddr
-                            and not self._taddr):
-            err_msg = "Long address selected, but no address field is present"
-
-        # IF Fctl.M is set, the re-transmitter address must exist
-        if not err_msg and bool(fctl & HeymacFrameFctl.M) and not self._taddr:
-            err_msg = "Fctl.M is set, but re-transmit address is missing"
-
-        # If Fctl.X is set, only the payload should exist
-        if not err_msg and HeymacFrameFctl.X & fctl:
-            for _, field_nm in FIELD_INFO:
-                field = getattr(self, field_nm)
-                if field:
-                    err_msg = "Extended frame has field other than {}" \
-                              .format(field_nm)
-                    break
+        # (Fctl.M without a re-transmit address is caught above)
+        if fctl & HeymacFrame._FCTL_L and not (daddr or saddr or taddr):
+            raise HeymacFrameError(
+                "Long address selected, but no address field is present")
+
 
-        if err_msg:
-            raise HeymacFrameError(err_msg)
+# The parse layout of every regular (non-extended) frame, indexed by Fctl
+HeymacFrame._PARSE_LAYOUTS = tuple(map(HeymacFrame._parse_layout,
+                                       range(HeymacFrame._FCTL_X)))
+
+# The total size of the fixed-size fields (all but PID, Fctl, IEs and payload)
+# of every regular frame, indexed by Fctl
+HeymacFrame._FIXED_FLDS_SZS = tuple(
+    sum(sz for _, sz in head_flds) + mhop_sz
+    for head_flds, mhop_sz in HeymacFrame._PARSE_LAYOUTS)
+
+# The PID type of every PID value, or None if the PID ident is not Heymac
+HeymacFrame._PID_TYPES = tuple(
+    pid & HeymacFrame._PID_TYPE_MASK
+    if pid & HeymacFrame._PID_IDENT_MASK == HeymacFrame._PID_HEYMAC else None
+    for pid in range(256))
+
+
+class HeymacFrameSlice():
+    """A read-only view of the fields of a serialized Heymac frame.
+
+    HeymacFrameSlice.slice() only locates the fields in the frame bytes.
+    A field is copied out of the frame when it is read and
+    the payload is not parsed.  This is quicker than HeymacFrame.parse()
+    when only a few fields are needed, for example,
+    to drop frames that are not addressed to this node::
+
+        frame_slice = HeymacFrameSlice.slice(phy_payld)
+        if frame_slice.daddr in (my_addr, None):
+            frame = frame_slice.to_frame()
+    """
+    __slots__ = ("_buf", "_offs")
+
+    # The index into _offs of each field
+    _NETID_IDX = 0
+    _DADDR_IDX = 1
+    _IE_SQNC_IDX = 2
+    _SADDR_IDX = 3
+    _PAYLD_IDX = 4
+    _TADDR_IDX = 5
+
+    # The index of each field by the name HeymacFrame parses it into
+    _FLD_IDXS = {"_netid": _NETID_IDX, "_daddr": _DADDR_IDX,
+                 "_ie_sqnc": _IE_SQNC_IDX, "_saddr": _SADDR_IDX,
+                 "_payld": _PAYLD_IDX, "_taddr": _TADDR_IDX}
+
+    def __init__(self, buf, offs):
+        self._buf = buf
+        self._offs = offs
+
+    @staticmethod
+    def slice(frame_bytes):
+        """Locates the fields in frame_bytes and returns a HeymacFrameSlice.
+
+        Raises a HeymacFrameError if the frame's PID is not Heymac
+        or its fields do not fit in frame_bytes.
+        """
+        if type(frame_bytes) is not bytes:
+            try:
+                frame_bytes = bytes(frame_bytes)
+            except (TypeError, ValueError):
+                raise HeymacFrameError(
+                    "frame_bytes must be a sequence of bytes")
+        frame_sz = len(frame_bytes)
+        if frame_sz < HeymacFrame.MIN_LEN:
+            raise HeymacFrameError("Frame must be 2 or more bytes in length")
+        if HeymacFrame._PID_TYPES[frame_bytes[0]] is None:
+            raise HeymacFrameError("Invalid PID ident")
+
+        # (offset, size) of each field in _FLD_IDXS order
+        offs = [None] * len(HeymacFrameSlice._FLD_IDXS)
+        fctl = frame_bytes[1]
+        offset = 2
+        if fctl & HeymacFrame._FCTL_X:
+            offs[HeymacFrameSlice._PAYLD_IDX] = (offset, frame_sz - offset)
+        else:
+            head_flds, mhop_sz = HeymacFrame._PARSE_LAYOUTS[fctl]
+            for fld_nm, sz in head_flds:
+                if not sz:
+                    sz = len(HeymacIeSequence.parse(frame_bytes, offset))
+                offs[HeymacFrameSlice._FLD_IDXS[fld_nm]] = (offset, sz)
+                offset += sz
+            payld_sz = frame_sz - offset - mhop_sz
+            if payld_sz < 0:
+                raise HeymacFrameError("Insufficient bytes")
+            if payld_sz:
+                offs[HeymacFrameSlice._PAYLD_IDX] = (offset, payld_sz)
+            if mhop_sz:
+                offs[HeymacFrameSlice._TADDR_IDX] = (offset + payld_sz,
+                                                     mhop_sz)
+        return HeymacFrameSlice(frame_bytes, tuple(offs))
+
+
+    def get_sender(self):
+        """Returns the sender of the frame (source or re-transmitter)."""
+        sender = self.taddr
+        if sender is None:
+            sender = self.saddr
+        return sender
+
+
+    def to_frame(self):
+        """Returns the fully parsed and validated HeymacFrame."""
+        return HeymacFrame.parse(self._buf)
+
+    @property
+    def pid(self):
+        return self._buf[0]
+
+    @property
+    def fctl(self):
+        return self._buf[1]
+
+    @property
+    def netid(self):
+        return self._get_fld(HeymacFrameSlice._NETID_IDX)
+
+    @property
+    def daddr(self):
+        return self._get_fld(HeymacFrameSlice._DADDR_IDX)
+
+    @property
+    def ies(self):
+        return self._get_fld(HeymacFrameSlice._IE_SQNC_IDX)
+
+    @property
+    def saddr(self):
+        return self._get_fld(HeymacFrameSlice._SADDR_IDX)
+
+    @property
+    def payld(self):
+        """Returns the payload's bytes; the payload is not parsed."""
+        return self._get_fld(HeymacFrameSlice._PAYLD_IDX)
+
+    @property
+    def taddr(self):
+        return self._get_fld(HeymacFrameSlice._TADDR_IDX)
+
+
+# Private
+
+    def _get_fld(self, idx):
+        """Returns a copy of the field's bytes or None if it is absent."""
+        off = self._offs[idx]
+        if off is None:
+            return None
+        offset, sz = off
+        return self._buf[offset:offset + sz]
 
 
 class HeymacIeError(HeymacFrameError):
@@ -507,6 +801,21 @@ class HeymacIe():
     TYPE_FRAGN = 0b00_000010
     TYPE_MIC = 0b00_000011
 
+    # Subclasses declare the slots for the kwargs they give to __init__
+    __slots__ = ("_iectl",)
+
+    # IEctl followed by a 16-bit value (the SZ_2B IEs)
+    _IECTL_U16_STRUCT = struct.Struct("!BH")
+
+    # IE classes by _IECTL_VAL, filled in as subclasses are defined
+    _IE_CLASSES = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        iectl_val = cls.__dict__.get("_IECTL_VAL")
+        if iectl_val is not None:
+            HeymacIe._IE_CLASSES[iectl_val] = cls
+
     def __init__(self, ie_ctl, **kwargs):
         self._iectl = ie_ctl
         for k, v in kwargs.items():
@@ -514,7 +823,7 @@ class HeymacIe():
 
     def __bytes__(self):
         # This only works for SZ_BIT*.  Other sizes will need to override this.
-        return struct.pack("B", self._iectl)[0]
+        return bytes((self._iectl,))
 
     def __len__(self):
         # FIXME: this doesn't handle IEs of SZ_N
@@ -530,83 +839,97 @@ class HeymacIe():
             raise HeymacIeError("Sz byte absent")
         return sz
 
+    @staticmethod
+    def _parse_u16(ie_bytes, offset=0):
+        """Returns the 16-bit value that follows the IEctl at the offset."""
+        if len(ie_bytes) < offset + 3:
+            raise HeymacIeError("insufficient bytes for IE value")
+        return HeymacIe._IECTL_U16_STRUCT.unpack_from(ie_bytes, offset)[1]
+
     @classmethod
-    def parse(cls, ie_bytes):
-        subcls = HeymacIeUnknown
-        subclasses = list(HeymacHIe.__subclasses__())
-        subclasses.extend(HeymacPIe.__subclasses__())
-        for ie_cls in subclasses:
-            if ie_cls._IECTL_VAL == ie_bytes[0]:
-                subcls = ie_cls
-                break
-        return subcls.parse(ie_bytes)
+    def parse(cls, ie_bytes, offset=0):
+        """Parses the IE that starts at the offset in ie_bytes."""
+        if len(ie_bytes) <= offset:
+            raise HeymacIeError("insufficient bytes for IE")
+        subcls = HeymacIe._IE_CLASSES.get(ie_bytes[offset], HeymacIeUnknown)
+        return subcls.parse(ie_bytes, offset)
 
 
 class HeymacIeUnknown(HeymacIe):
+    __slots__ = ()
     _IECTL_VAL = None
 
+    @staticmethod
+    def parse(ie_bytes, offset=0):
+        raise HeymacIeError("Unknown IE")
+
 
 class HeymacHIe(HeymacIe):
-    pass
+    __slots__ = ()
 
 
 class HeymacPIe(HeymacIe):
-    pass
+    __slots__ = ()
 
 
 class HeymacHIeTerm(HeymacHIe):
+    __slots__ = ()
     _IECTL_VAL = HeymacIe.SZ_BIT0 | HeymacIe.TYPE_TERM_HIE
 
     def __init__(self):
         super().__init__(self._IECTL_VAL)
 
     @staticmethod
-    def parse(ie_bytes):
+    def parse(ie_bytes, offset=0):
         return HeymacHIeTerm()
 
 
 class HeymacHIeSqncNmbr(HeymacHIe):
+    __slots__ = ("_sqnc_nmbr",)
     _IECTL_VAL = HeymacIe.SZ_2B | HeymacIe.TYPE_SQNC
 
     def __init__(self, sqnc_nmbr):
         super().__init__(self._IECTL_VAL, _sqnc_nmbr=sqnc_nmbr)
 
     def __bytes__(self):
-        return struct.pack("!BH", self._iectl, self._sqnc_nmbr)
+        return HeymacIe._IECTL_U16_STRUCT.pack(
+            self._iectl, self._sqnc_nmbr)
 
     @staticmethod
-    def parse(ie_bytes):
-        if len(ie_bytes) < 2:
-            raise HeymacIeError("insufficient bytes for Sequence Number")
-        return HeymacHIeSqncNmbr(struct.unpack("!H", ie_bytes[1:3])[0])
+    def parse(ie_bytes, offset=0):
+        return HeymacHIeSqncNmbr(HeymacIe._parse_u16(ie_bytes, offset))
 
 
 class HeymacHIeCipher(HeymacHIe):
+    __slots__ = ("_cipher_info",)
     _IECTL_VAL = HeymacIe.SZ_2B | HeymacIe.TYPE_CIPHER
 
     def __init__(self, cipher_info):
         super().__init__(self._IECTL_VAL, _cipher_info=cipher_info)
 
     def __bytes__(self):
-        return struct.pack("!BH", self._iectl, self._cipher_info)
+        return HeymacIe._IECTL_U16_STRUCT.pack(
+            self._iectl, self._cipher_info)
 
     @staticmethod
-    def parse(ie_bytes):
-        return HeymacHIeCipher(struct.unpack("!H", ie_bytes[1:3])[0])
+    def parse(ie_bytes, offset=0):
+        return HeymacHIeCipher(HeymacIe._parse_u16(ie_bytes, offset))
 
 
 class HeymacPIeTerm(HeymacPIe):
+    __slots__ = ()
     _IECTL_VAL = HeymacIe.SZ_BIT0 | HeymacIe.TYPE_TERM_PIE | HeymacIe.TYPE_PIE
 
     def __init__(self):
         super().__init__(self._IECTL_VAL)
 
     @staticmethod
-    def parse(ie_bytes):
+    def parse(ie_bytes, offset=0):
         return HeymacPIeTerm()
 
 
 class HeymacPIeFrag0(HeymacPIe):
+    __slots__ = ("_dgram_sz", "_dgram_tag")
     _IECTL_VAL = HeymacIe.SZ_2B | HeymacIe.TYPE_FRAG0 | HeymacIe.TYPE_PIE
 
     def __init__(self, dgram_sz, dgram_tag):
@@ -615,19 +938,19 @@ class HeymacPIeFrag0(HeymacPIe):
                          _dgram_tag=dgram_tag)
 
     def __bytes__(self):
-        return struct.pack("!BH",
-                           self._iectl,
-                           (self._dgram_sz << 5) | self._dgram_tag)
+        return HeymacIe._IECTL_U16_STRUCT.pack(
+            self._iectl, (self._dgram_sz << 5) | self._dgram_tag)
 
     @staticmethod
-    def parse(ie_bytes):
-        data = struct.unpack("!H", ie_bytes[1:3])[0]
+    def parse(ie_bytes, offset=0):
+        data = HeymacIe._parse_u16(ie_bytes, offset)
         dgram_sz = data >> 5
         dgram_tag = data & 0x1F
         return HeymacPIeFrag0(dgram_sz, dgram_tag)
 
 
 class HeymacPIeFragN(HeymacPIe):
+    __slots__ = ("_dgram_offset", "_dgram_tag")
     _IECTL_VAL = HeymacIe.SZ_2B | HeymacIe.TYPE_FRAGN | HeymacIe.TYPE_PIE
 
     def __init__(self, dgram_offset, dgram_tag):
@@ -636,38 +959,39 @@ class HeymacPIeFragN(HeymacPIe):
                          _dgram_tag=dgram_tag)
 
     def __bytes__(self):
-        return struct.pack("!BH",
-                           self._iectl,
-                           (self._dgram_offset << 5) | self._dgram_tag)
+        return HeymacIe._IECTL_U16_STRUCT.pack(
+            self._iectl, (self._dgram_offset << 5) | self._dgram_tag)
 
     @staticmethod
-    def parse(ie_bytes):
-        data = struct.unpack("!H", ie_bytes[1:3])[0]
+    def parse(ie_bytes, offset=0):
+        data = HeymacIe._parse_u16(ie_bytes, offset)
         dgram_offset = data >> 5
         dgram_tag = data & 0x1F
         return HeymacPIeFragN(dgram_offset, dgram_tag)
 
 
 class HeymacPIeMic(HeymacPIe):
+    __slots__ = ("_mic_algo", "_mic_sz")
     _IECTL_VAL = HeymacIe.SZ_2B | HeymacIe.TYPE_MIC | HeymacIe.TYPE_PIE
 
     def __init__(self, mic_algo, mic_sz):
         super().__init__(self._IECTL_VAL, _mic_algo=mic_algo, _mic_sz=mic_sz)
 
     def __bytes__(self):
-        return struct.pack("!BH",
-                           self._iectl,
-                           (self._mic_algo << 8) | (self._mic_sz & 0x0F))
+        return HeymacIe._IECTL_U16_STRUCT.pack(
+            self._iectl, (self._mic_algo << 8) | (self._mic_sz & 0x0F))
 
     @staticmethod
-    def parse(ie_bytes):
-        data = struct.unpack("!H", ie_bytes[1:3])[0]
+    def parse(ie_bytes, offset=0):
+        data = HeymacIe._parse_u16(ie_bytes, offset)
         mic_algo = data >> 8
         mic_sz = data & 0x0F
         return HeymacPIeMic(mic_algo, mic_sz)
 
 
 class HeymacIeSequence():
+    __slots__ = ("_ies",)
+
     def __init__(self, *ies):
         self._ies = ies
 
@@ -685,7 +1009,7 @@ class HeymacIeSequence():
     def parse(frame_bytes, offset=0):
         ies = []
         while True:
-            ie = HeymacIe.parse(frame_bytes[offset:])
+            ie = HeymacIe.parse(frame_bytes, offset)
             ies.append(ie)
             offset += len(ie)
             if type(ie) is HeymacPIeTerm:
@@ -14,7 +14,7 @@ import farc
 
 from .heymac_link import HeymacLink
 from .heymac_frame import *
-from .heymac_cmd import HeymacCmd, HeymacCmdError, HeymacCmdBcn
+from .heymac_cmd import HeymacCmd, HeymacCmdUnknown, HeymacCmdBcn
 from ..utl import HamIdent
 
 
@@ -64,6 +64,11 @@ class HeymacCsmaHsm(farc.Ahsm):
 
     Automates beaconing and frame processing.
     """
+    # The number of received frames that may await processing.
+    # MUST be a power of two so the ring index is a bit mask.
+    _RX_RING_SZ = 64
+    _RX_RING_MASK = _RX_RING_SZ - 1
+
     def __init__(self, phy):
         """Class intialization"""
         super().__init__()
@@ -75,6 +80,16 @@ class HeymacCsmaHsm(farc.Ahsm):
 
         self._rx_clbk = None
 
+        # The serialized beacon frame (built when first needed)
+        self._bcn_bytes = None
+
+        # A fixed-size ring of frames received from the PHY.
+        # The head is where the next frame is put,
+        # the tail is the next frame to process.
+        self._rx_ring = [None] * HeymacCsmaHsm._RX_RING_SZ
+        self._rx_head = 0
+        self._rx_tail = 0
+
 
     def get_lnk_addr(self):
         return self._lnk_addr
@@ -103,6 +118,7 @@ class HeymacCsmaHsm(farc.Ahsm):
             self._pub_key = bytes.fromhex(cred["pub_key"])
             self._lnk_addr = HamIdent.get_addr("HeyMac", 64)
             self._lnk_data = HeymacLink(self._lnk_addr)
+            self._bcn_bytes = None
 
 
 # State machine
@@ -120,6 +136,7 @@ class HeymacCsmaHsm(farc.Ahsm):
 
         # Self-signaling events
         self._evt_always = farc.Event(farc.Signal._ALWAYS, None)
+        self._evt_rxd = farc.Event(farc.Signal._LNK_RXD_FROM_PHY, None)
 
         # Timer events
         self._bcn_evt = farc.TimeEvent("_LNK_BCN_TMOUT")
@@ -170,6 +187,9 @@ class HeymacCsmaHsm(farc.Ahsm):
         if sig == farc.Signal.ENTRY:
             logging.debug("LNK._lurking")
             self._bcn_evt.post_in(self, 2 * Heymac._BCN_PRD)
+            # Process any frames that arrived before lurking
+            if self._rx_head != self._rx_tail:
+                self.post_fifo(self._evt_rxd)
             return self.handled(event)
 
         elif sig == farc.Signal._LNK_BCN_TMOUT:
@@ -182,7 +202,7 @@ class HeymacCsmaHsm(farc.Ahsm):
                 return self.handled(event)
 
         elif sig == farc.Signal._LNK_RXD_FROM_PHY:
-            self._on_rxd_from_phy(event.value)
+            self._process_rx_ring()
             return self.handled(event)
 
         elif sig == farc.Signal.EXIT:
@@ -211,7 +231,7 @@ class HeymacCsmaHsm(farc.Ahsm):
             return self.handled(event)
 
         elif sig == farc.Signal._LNK_RXD_FROM_PHY:
-            self._on_rxd_from_phy(event.value)
+            self._process_rx_ring()
             if self._lnk_data.ngbr_hears_me():
                 return self.tran(self._linking)
             return self.handled(event)
@@ -254,14 +274,14 @@ class HeymacCsmaHsm(farc.Ahsm):
 
     def _on_rxd_from_phy(self, frame):
         """Processes a frame received from the PHY."""
-        assert type(frame) is HeymacFrame
-
-        # Attach the Heymac command, if present
-        try:
-            cmd = HeymacCmd.parse(frame.payld)
-        except HeymacCmdError:
-            cmd = None
-        frame.cmd = cmd
+        # Attach the Heymac command, if present.
+        # HeymacFrame.parse() has already parsed the payload
+        # so there is no need to parse it again.
+        payld = frame.payld
+        if isinstance(payld, (HeymacCmd, HeymacCmdUnknown)):
+            frame.cmd = payld
+        else:
+            frame.cmd = None
 
         # Process the frame for link data, etc.
         self._lnk_data.process_frame(frame)
@@ -283,26 +303,74 @@ class HeymacCsmaHsm(farc.Ahsm):
 
         The PHY calls this method with these arguments
         when it receives a frame with no errors.
-        This method collects the arguments in a container
-        and posts an event to this state machine.
+        This method puts the parsed frame in the rx ring.
+        If the ring was empty, it posts the rx event
+        to this state machine, which then processes
+        every frame in the ring.
         """
         # Parse the bytes into a frame
         # and store reception meta-data
         try:
             frame = HeymacFrame.parse(rx_bytes)
-            frame.rx_meta = (rx_time, rx_rssi, rx_snr)
+            frame.rx_time = rx_time
+            frame.rx_rssi = rx_rssi
+            frame.rx_snr = rx_snr
         except HeymacFrameError:
             logging.info("LNK:rxd frame is not valid Heymac\n\t{}"
                          .format(rx_bytes))
             # TODO: lnk stats incr rxd frame is not Heymac
             return
 
-        # The frame is valid, post it to the state machine
-        self.post_fifo(farc.Event(farc.Signal._LNK_RXD_FROM_PHY, frame))
+        # The frame is valid, put it in the ring
+        rx_cnt = self._rx_head - self._rx_tail
+        if rx_cnt >= HeymacCsmaHsm._RX_RING_SZ:
+            logging.info("LNK:rx ring is full, dropping frame")
+            # TODO: lnk stats incr rxd frame dropped
+            return
+        self._rx_ring[self._rx_head & HeymacCsmaHsm._RX_RING_MASK] = frame
+        self._rx_head += 1
+
+        # Post the event only if one is not already pending
+        if rx_cnt == 0:
+            self.post_fifo(self._evt_rxd)
+
+
+    def _process_rx_ring(self):
+        """Processes every frame in the rx ring."""
+        try:
+            while self._rx_tail != self._rx_head:
+                self._on_rxd_from_phy(self._pop_rxd_frame())
+        finally:
+            # If a frame raised, post again so the rest are not stranded
+            if self._rx_tail != self._rx_head:
+                self.post_fifo(self._evt_rxd)
+
+
+    def _pop_rxd_frame(self):
+        """Removes and returns the oldest frame in the rx ring."""
+        idx = self._rx_tail & HeymacCsmaHsm._RX_RING_MASK
+        frame = self._rx_ring[idx]
+        self._rx_ring[idx] = None
+        self._rx_tail += 1
+        return frame
 
 
     def _post_bcn(self):
-        """Builds a Heymac CsmaBeacon and posts it to the PHY for transmit."""
+        """Posts a Heymac CsmaBeacon to the PHY for transmit.
+
+        The beacon's contents only change with the credentials,
+        so the beacon frame is built and serialized once and re-used.
+        """
+        if not self._bcn_bytes:
+            self._bcn_bytes = self._build_bcn()
+        self._phy_hsm.post_tx_action(
+            self._phy_hsm.TM_NOW,
+            Heymac._PHY_STNGS_TX,
+            self._bcn_bytes)
+
+
+    def _build_bcn(self):
+        """Builds a Heymac CsmaBeacon frame and returns it serialized."""
         callsign = self._callsign.ljust(16).encode()
 
         bcn = HeymacCmdBcn(
@@ -314,10 +382,7 @@ class HeymacCsmaHsm(farc.Ahsm):
         frame = HeymacFrame(HeymacFramePidType.CSMA)
         frame.saddr = self._lnk_addr
         frame.payld = bytes(bcn)
-        self._phy_hsm.post_tx_action(
-            self._phy_hsm.TM_NOW,
-            Heymac._PHY_STNGS_TX,
-            bytes(frame))
+        return bytes(frame)
 
 
     def _post_frm(self, frame):
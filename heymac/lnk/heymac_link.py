@@ -2,9 +2,10 @@
 """
 
 
+import heapq
+
 import farc
 
-from .heymac_frame import HeymacFrame
 from .heymac_cmd import HeymacCmdBcn
 
 
@@ -12,7 +13,8 @@ class HeymacLink():
     """Heymac link layer data.
 
     _ngbr_data is a dict that holds data for each neighbor.
-    The neighbor's link address is the key.  The value is a dict with items:
+    The neighbor's link address (bytes) is the key.
+    The value is a dict with items:
 
     ==================  =======================================================
     Key                 Value
@@ -24,13 +26,30 @@ class HeymacLink():
     "LATEST_RX_SNR"     SNR of latest RX of any valid HeymacFrame from ngbr
     ==================  =======================================================
     """
+    __slots__ = ("_lnk_addr", "_ngbrs", "_exp_heap", "_gen", "_now")
+
     def __init__(self, lnk_addr):
         self._lnk_addr = lnk_addr
         self._ngbrs = {}
 
+        # A min-heap of (expiration time, lnk_addr, generation) entries.
+        # A neighbor's generation increments every time it is heard,
+        # so heap entries with an older generation are stale.
+        self._exp_heap = []
+        self._gen = {}
+
+        # The event loop's clock, bound once
+        self._now = farc.Framework._event_loop.time
+
 
     def get_ngbrs_lnk_addrs(self):
-        """Returns a list of neighbors' link addresses."""
+        """Returns the neighbors' link addresses as bytes.
+
+        The value is a view of the neighbor data's keys, not a copy,
+        so it always reflects the current neighbors.  Do not hold it
+        across calls to process_frame() or update();
+        make a set() or list() of it if a snapshot is needed.
+        """
         return self._ngbrs.keys()
 
 
@@ -56,37 +75,54 @@ class HeymacLink():
 
 
     def process_frame(self, frame):
-        """Update link data with info from the given frame."""
-        assert type(frame) is HeymacFrame
-
-        # Init data for a new neighbor
+        """Update link data with info from the given frame.
+        A frame without a sender address says nothing about
+        a neighbor, so it is ignored.
+        """
         lnk_addr = frame.get_sender()
-        if lnk_addr not in self._ngbrs:
-            self._ngbrs[lnk_addr] = {"BCN_CNT": 0}
+        if lnk_addr is None:
+            return
+
+        # Get the neighbor's data, init data for a new neighbor
+        d = self._ngbrs.get(lnk_addr)
+        if d is None:
+            d = {"BCN_CNT": 0}
+            self._ngbrs[lnk_addr] = d
 
         # Update rx meta data
-        d = self._ngbrs[lnk_addr]
-        d["LATEST_RX_TM"] = frame.rx_meta[0]
-        d["LATEST_RX_RSSI"] = frame.rx_meta[1]
-        d["LATEST_RX_SNR"] = frame.rx_meta[2]
+        rx_time = frame.rx_time
+        d["LATEST_RX_TM"] = rx_time
+        d["LATEST_RX_RSSI"] = frame.rx_rssi
+        d["LATEST_RX_SNR"] = frame.rx_snr
 
-        # Process a beacon
-        if frame.cmd and type(frame.cmd) is HeymacCmdBcn:
-            self._process_bcn(frame)
+        # Schedule the neighbor's expiration
+        gen = self._gen.get(lnk_addr, 0) + 1
+        self._gen[lnk_addr] = gen
+        heapq.heappush(self._exp_heap,
+                       (rx_time + self._EXPIRATION_PRD, lnk_addr, gen))
+
+        # Process the frame's command, if it has a handler
+        cmd_hndlr = HeymacLink._CMD_HNDLRS.get(type(frame.cmd))
+        if cmd_hndlr:
+            cmd_hndlr(self, frame, d)
 
 
     def update(self):
-        """Performs periodic update of the link data."""
-        now = farc.Framework._event_loop.time()
-        # Collect and prune expired neighbors
-        expired_ngbrs = []
-        for ngbr_addr, ngbr_data in self._ngbrs.items():
-            frame = ngbr_data["BCN_FRAME"]
-            rx_time = frame.rx_meta[0]
-            if now > rx_time + self._EXPIRATION_PRD:
-                expired_ngbrs.append(ngbr_addr)
-        for ngbr_addr in expired_ngbrs:
-            del self._ngbrs[ngbr_addr]
+        """Performs periodic update of the link data.
+
+        Prunes neighbors that have not been heard from
+        within the expiration period.  Only the expired
+        entries at the top of the expiration heap are visited.
+        """
+        now = self._now()
+        exp_heap = self._exp_heap
+        ngbrs = self._ngbrs
+        gens = self._gen
+        while exp_heap and exp_heap[0][0] < now:
+            _, ngbr_addr, gen = heapq.heappop(exp_heap)
+            if gen == gens.get(ngbr_addr):
+                del ngbrs[ngbr_addr]
+                del gens[ngbr_addr]
 
 
 # Private
@@ -98,9 +134,16 @@ class HeymacLink():
     _EXPIRATION_PRD = 4 * 32    # heymac_hsm.Heymac._BCN_PRD
 
 
-    def _process_bcn(self, frame):
-        """Process a Heymac beacon and keeps relevant link data."""
-        lnk_addr = frame.get_sender()
-        d = self._ngbrs[lnk_addr]
-        d["BCN_FRAME"] = frame
-        d["BCN_CNT"] += 1
+    def _process_bcn(self, frame, ngbr_data):
+        """Process a Heymac beacon and keeps relevant link data.
+
+        ngbr_data is the sender's entry in the neighbor data.
+        """
+        ngbr_data["BCN_FRAME"] = frame
+        ngbr_data["BCN_CNT"] += 1
+
+
+    # Link data handlers for received commands, by command class
+    _CMD_HNDLRS = {
+        HeymacCmdBcn: _process_bcn,
+    }
@@ -64,6 +64,10 @@ class APv6Packet():
     IPHC_HLIM_64 = 0b1000
     IPHC_HLIM_255 = 0b1100
 
+    # The hop limits that are encoded in the header rather than in-line
+    _HLIM_BY_HOPS = {1: IPHC_HLIM_1, 64: IPHC_HLIM_64, 255: IPHC_HLIM_255}
+    _HOPS_BY_HLIM = {IPHC_HLIM_1: 1, IPHC_HLIM_64: 64, IPHC_HLIM_255: 255}
+
     IPHC_SAM_MASK = 0b10        # Src addr omit
     IPHC_SAM_INLINE = 0b00      # full 128-bit address is in-line
     IPHC_SAM_OMIT = 0b10        # address is omitted
@@ -81,6 +85,9 @@ class APv6Packet():
 
     FIELD_NAMES = ("hdr", "hops", "saddr", "daddr", "nhc", "payld")
 
+    # In the order the fields are serialized and parsed
+    __slots__ = ("_hdr", "_hops", "_saddr", "_daddr", "_nhc", "_payld")
+
     def __init__(self, **kwargs):
         """Creates an APv6 packet with the given fields"""
         self._hdr = (APv6Packet.DEFAULT_PREFIX
@@ -102,21 +109,21 @@ class APv6Packet():
     def __bytes__(self):
         """Returns the APv6Packet serialized into a bytes object."""
         # TODO: self._validate_hdr_and_fields()
-        pkt = bytearray()
-        pkt.append(self._hdr)
+        # Join immutable parts rather than growing a bytearray
         if self._hops:
-            pkt.append(self._hops)
+            parts = [bytes((self._hdr, self._hops))]
+        else:
+            parts = [bytes((self._hdr,))]
         if self._saddr:
-            pkt.extend(self._saddr)
+            parts.append(self._saddr)
         if self._daddr:
-            pkt.extend(self._daddr)
-        if self._payld:
-            if type(self._payld) is not bytes:
-                b = bytes(self._payld)
-            else:
-                b = self._payld
-            pkt.extend(b)
-        return bytes(pkt)
+            parts.append(self._daddr)
+        payld = self._payld
+        if payld:
+            if type(payld) is not bytes:
+                payld = bytes(payld)
+            parts.append(payld)
+        return b"".join(parts)
 
     @staticmethod
     def parse(pkt_bytes):
@@ -125,8 +132,11 @@ class APv6Packet():
         Raises an APv6PacketError if some bits or fields
         are not set properly.
         """
-        if max(pkt_bytes) > 255 or min(pkt_bytes) < 0:
-            raise APv6PacketError("pkt_bytes must be a sequence of bytes")
+        if type(pkt_bytes) is not bytes:
+            try:
+                pkt_bytes = bytes(pkt_bytes)
+            except (TypeError, ValueError):
+                raise APv6PacketError("pkt_bytes must be a sequence of bytes")
         if len(pkt_bytes) < 1:
             raise APv6PacketError("pkt_bytes must have at least one byte")
 
@@ -157,7 +167,7 @@ class APv6Packet():
 
     @property
     def hdr(self):
-        return struct.pack("B", self._hdr)
+        return bytes((self._hdr,))
 
     @hdr.setter
     def hdr(self, val):
@@ -170,22 +180,18 @@ class APv6Packet():
         if hops_idx == APv6Packet.IPHC_HLIM_INLINE:
             h = self._hops
         else:
-            h = {APv6Packet.IPHC_HLIM_1: 1,
-                 APv6Packet.IPHC_HLIM_64: 64,
-                 APv6Packet.IPHC_HLIM_255: 255}[hops_idx]
-        return struct.pack("B", h)
+            h = APv6Packet._HOPS_BY_HLIM[hops_idx]
+        return bytes((h,))
 
     @hops.setter
     def hops(self, val):
         if type(val) is bytes:
             val = val[0]
-        hlim = {1: APv6Packet.IPHC_HLIM_1,
-                64: APv6Packet.IPHC_HLIM_64,
-                255: APv6Packet.IPHC_HLIM_255}
+        hlim = APv6Packet._HLIM_BY_HOPS.get(val)
         self._hdr &= ~APv6Packet.IPHC_HLIM_MASK
-        if val in hlim.keys():
+        if hlim is not None:
             self._hops = None
-            self._hdr |= hlim[val]
+            self._hdr |= hlim
         else:
             if val > 255:
                 raise APv6PacketError("Hops value out of range")
@@ -198,7 +204,8 @@ class APv6Packet():
 
     @saddr.setter
     def saddr(self, val):
-        assert len(val) == 16
+        if len(val) != 16:
+            raise APv6PacketError("Source address must be 16 bytes")
         self._saddr = val
         self._hdr &= ~APv6Packet.IPHC_SAM_OMIT
 
@@ -208,10 +215,20 @@ class APv6Packet():
 
     @daddr.setter
     def daddr(self, val):
-        assert len(val) == 16
+        if len(val) != 16:
+            raise APv6PacketError("Destination address must be 16 bytes")
         self._daddr = val
         self._hdr &= ~APv6Packet.IPHC_DAM_OMIT
 
+    @property
+    def nhc(self):
+        return self._nhc
+
+    @nhc.setter
+    def nhc(self, val):
+        # TODO validate
+        self._nhc = val
+
     @property
     def payld(self):
         return self._payld
@@ -260,8 +277,13 @@ class UdpDatagram():
     DEFAULT_CS_OMIT = _UDPHC_CS_OMIT
     DEFAULT_PORTS = 0
 
+    _PORT_STRUCT = struct.Struct("!H")
+
     _FIELD_NAMES = ("hdr", "src_port", "dst_port", "payld")
 
+    # In the order the fields are serialized and parsed
+    __slots__ = ("_hdr", "_src_port", "_dst_port", "_payld")
+
     def __init__(self, **kwargs):
         """Creates a UDP datagram with the given fields"""
         self._hdr = (UdpDatagram.DEFAULT_PREFIX
@@ -279,49 +301,52 @@ class UdpDatagram():
     def __bytes__(self):
         """Returns the UDP Datagram serialized into a bytes object."""
         # port values may have changed, so must compress the ports
-        # which update the port mode, before we serialize the hdr
-        ports = self._compress_ports()
-        dgram = bytearray()
-        dgram.append(self._hdr)
-        dgram.extend(ports)
-        if self._payld:
-            dgram.extend(self._payld)
-        return bytes(dgram)
+        # which update the port mode in the hdr
+        hdr_and_ports = self._compress_ports()
+        payld = self._payld
+        if not payld:
+            return hdr_and_ports
+        if type(payld) is not bytes:
+            payld = bytes(payld)
+        return hdr_and_ports + payld
 
     def _compress_ports(self):
-        """Returns serialized representation of compressed ports"""
+        """Returns the hdr and the compressed ports serialized together"""
         if self._src_port is None:
             raise UdpDatagramError("Source port not given")
         if self._dst_port is None:
             raise UdpDatagramError("Destination port not given")
 
-        ports = bytearray()
-        src_mode = self._get_port_mode(self._src_port)
-        dst_mode = self._get_port_mode(self._dst_port)
+        # Each mode's ports are combined into one int with the hdr
+        # and converted to bytes once
+        src_port = self._src_port
+        dst_port = self._dst_port
+        src_mode = self._get_port_mode(src_port)
+        dst_mode = self._get_port_mode(dst_port)
         if (src_mode == UdpDatagram._UDPHC_PORT_MODE_NIBBLE
                 and dst_mode == UdpDatagram._UDPHC_PORT_MODE_NIBBLE):
             mode_bits = UdpDatagram._UDPHC_PORTS_MODE_NIBBLE_NIBBLE
-            ports.append((self._src_port & 0x0F) << 4
-                         | (self._dst_port & 0x0F))
+            ports = (src_port & 0x0F) << 4 | (dst_port & 0x0F)
+            ports_sz = 1
         elif (src_mode == UdpDatagram._UDPHC_PORT_MODE_BYTE
                 or src_mode == UdpDatagram._UDPHC_PORT_MODE_NIBBLE):
             mode_bits = UdpDatagram._UDPHC_PORTS_MODE_BYTE_INLINE
-            ports.append(self._src_port & 0xFF)
-            ports.extend(self.dst_port)
+            ports = (src_port & 0xFF) << 16 | dst_port
+            ports_sz = 3
         elif (dst_mode == UdpDatagram._UDPHC_PORT_MODE_BYTE
                 or dst_mode == UdpDatagram._UDPHC_PORT_MODE_NIBBLE):
             mode_bits = UdpDatagram._UDPHC_PORTS_MODE_INLINE_BYTE
-            ports.extend(self.src_port)
-            ports.append(self._dst_port & 0xFF)
+            ports = src_port << 8 | (dst_port & 0xFF)
+            ports_sz = 3
         else:
             mode_bits = UdpDatagram._UDPHC_PORTS_MODE_INLINE_INLINE
-            ports.extend(self.src_port)
-            ports.extend(self.dst_port)
+            ports = src_port << 16 | dst_port
+            ports_sz = 4
 
-        self._hdr &= ~UdpDatagram._UDPHC_PORTS_MASK
-        self._hdr |= mode_bits
+        hdr = (self._hdr & ~UdpDatagram._UDPHC_PORTS_MASK) | mode_bits
+        self._hdr = hdr
 
-        return bytes(ports)
+        return (hdr << (8 * ports_sz) | ports).to_bytes(1 + ports_sz, "big")
 
     @classmethod
     def _get_port_mode(cls, port):
@@ -350,6 +375,8 @@ class UdpDatagram():
                 != UdpDatagram.DEFAULT_CS_OMIT):
             raise UdpDatagramError("Header CS-omit mismatch")
 
+        # Ports are unpacked in place rather than sliced out first
+        unpack_port = UdpDatagram._PORT_STRUCT.unpack_from
         port_mode = dgram._hdr & UdpDatagram._UDPHC_PORTS_MASK
         if port_mode == UdpDatagram._UDPHC_PORTS_MODE_NIBBLE_NIBBLE:
             if len(dgram_bytes) < 2:
@@ -363,21 +390,21 @@ class UdpDatagram():
                 raise UdpDatagramError("Insufficient bytes for ports")
             dgram._src_port = 0xF000 | dgram_bytes[offset]
             offset += 1
-            dgram.dst_port = dgram_bytes[offset:offset + 2]
+            dgram._dst_port = unpack_port(dgram_bytes, offset)[0]
             offset += 2
         elif port_mode == UdpDatagram._UDPHC_PORTS_MODE_INLINE_BYTE:
             if len(dgram_bytes) < 4:
                 raise UdpDatagramError("Insufficient bytes for ports")
-            dgram.src_port = dgram_bytes[offset:offset + 2]
+            dgram._src_port = unpack_port(dgram_bytes, offset)[0]
             offset += 2
             dgram._dst_port = 0xF000 | dgram_bytes[offset]
             offset += 1
         else:
             if len(dgram_bytes) < 5:
                 raise UdpDatagramError("Insufficient bytes for ports")
-            dgram.src_port = dgram_bytes[offset:offset + 2]
+            dgram._src_port = unpack_port(dgram_bytes, offset)[0]
             offset += 2
-            dgram.dst_port = dgram_bytes[offset:offset + 2]
+            dgram._dst_port = unpack_port(dgram_bytes, offset)[0]
             offset += 2
         dgram.payld = dgram_bytes[offset:]
 
@@ -387,27 +414,27 @@ class UdpDatagram():
     # Setters should accept int or bytes and save internal working type, int
     @property
     def hdr(self):
-        return struct.pack("B", self._hdr)
+        return bytes((self._hdr,))
 
     @property
     def src_port(self):
-        return struct.pack("!H", self._src_port)
+        return UdpDatagram._PORT_STRUCT.pack(self._src_port)
 
     @src_port.setter
     def src_port(self, val):
         if type(val) is bytes:
-            self._src_port = struct.unpack("!H", val)[0]
+            self._src_port = UdpDatagram._PORT_STRUCT.unpack(val)[0]
         else:
             self._src_port = val
 
     @property
     def dst_port(self):
-        return struct.pack("!H", self._dst_port)
+        return UdpDatagram._PORT_STRUCT.pack(self._dst_port)
 
     @dst_port.setter
     def dst_port(self, val):
         if type(val) is bytes:
-            self._dst_port = struct.unpack("!H", val)[0]
+            self._dst_port = UdpDatagram._PORT_STRUCT.unpack(val)[0]
         else:
             self._dst_port = val
 
@@ -139,16 +139,16 @@ from functools import reduce
 # Two-octet Root address
 ROOT2 = b"\x00\x00"
 
+# The two nibbles of each octet value, in internal representation
+_NIBBLE_PAIRS = tuple(bytes((b >> 4, b & 0xf)) for b in range(256))
+
 
 def to_internal_repr(addrx):
     """Returns a bytearray twice the length of the given address
     so that each nibble may be indexed
     """
     assert type(addrx) is bytes
-    addri = bytearray()
-    for b in addrx:
-        addri.extend([b >> 4, b & 0xf])
-    return addri
+    return bytearray(b"".join(map(_NIBBLE_PAIRS.__getitem__, addrx)))
 
 
 def to_external_addr(addri):
@@ -1,6 +1,12 @@
 # This file lets the project run on a PC,
 # but does no real action on hardware.
 class SpiDev():
+    # Canned replies to two-byte register reads, by register
+    _RESP = {
+        0x42: (0, 18),  # REG_VERSION returns CHIP_VERSION
+        0x01: (0, 1),   # REG_RDO_OPMODE returns STBY
+    }
+
     def close(self):
         pass
 
@@ -8,11 +14,8 @@ class SpiDev():
         pass
 
     def xfer2(self, b):
-        # If REG_VERSION, return CHIP_VERSION
-        if b[0] == 0x42 and len(b) == 2:
-            return [0, 18]
-        # If REG_RDO_OPMODE, return STBY
-        elif b[0] == 0x01 and len(b) == 2:
-            return [0, 1]
-        else:
-            return [0] * len(b)
+        if len(b) == 2:
+            resp = SpiDev._RESP.get(b[0])
+            if resp:
+                return list(resp)
+        return [0] * len(b)
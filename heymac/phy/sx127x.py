@@ -3,7 +3,6 @@ Copyright 2020 Dean Hall.  See LICENSE for details.
 """
 
 import collections
-import collections.abc
 import math
 import time
 
@@ -39,8 +38,9 @@ class NoiseAccumulator():
             cls._noise.append(cls._byte)
             cls._bit_cnt = 0
             cls._byte = 0
+            # Trim in place; bytearray deletes from the front cheaply
             if len(cls._noise) > NoiseAccumulator.MAX_LEN:
-                cls._noise = cls._noise[-NoiseAccumulator.MAX_LEN:]
+                del cls._noise[:-NoiseAccumulator.MAX_LEN]
 
     @classmethod
     def noise(cls, length=4):
@@ -51,7 +51,7 @@ class NoiseAccumulator():
         length = min(max(0, length), NoiseAccumulator.MAX_LEN)
         if length <= len(cls._noise):
             val = cls._noise[:length]
-            cls._noise = cls._noise[length:]
+            del cls._noise[:length]
         return val
 
 
@@ -79,6 +79,19 @@ class SX127x():
     DIO_TX_DONE = 9
     DIO_PAYLD_CRC_ERR = 10
 
+    # The signal each DIO gives for each of its applied
+    # FLD_RDO_DIOx mapping values, by DIO number
+    _DIO_SIG_LUTS = (
+        (DIO_RX_DONE, DIO_TX_DONE, DIO_CAD_DONE),
+        (DIO_RX_TMOUT, DIO_FHSS_CHG_CHNL, DIO_CAD_DETECTED),
+        (DIO_FHSS_CHG_CHNL, DIO_FHSS_CHG_CHNL, DIO_FHSS_CHG_CHNL),
+        (DIO_CAD_DONE, DIO_VALID_HDR, DIO_PAYLD_CRC_ERR),
+        (DIO_CAD_DETECTED, DIO_PLL_LOCK, DIO_PLL_LOCK),
+        (DIO_MODE_RDY, DIO_CLK_OUT, DIO_CLK_OUT),
+    )
+    _DIO_FLDS = ("FLD_RDO_DIO0", "FLD_RDO_DIO1", "FLD_RDO_DIO2",
+                 "FLD_RDO_DIO3", "FLD_RDO_DIO4", "FLD_RDO_DIO5")
+
     # SX127x Radio register addresses
     REG_RDO_FIFO = 0x00
     REG_RDO_OPMODE = 0x01
@@ -138,6 +151,20 @@ class SX127x():
     OPMODE_RXONCE = 6
     OPMODE_CAD = 7
 
+    # Errata 2.3 values for LoRa RX, by LoRa BW below 500 kHz:
+    # the IF Freq 2 reg value and the carrier's rejection offset [Hz]
+    _ERRATA_IF_FREQ2_LUT = (
+        0x48, 0x44, 0x44, 0x44, 0x44, 0x44, 0x40, 0x40, 0x40)
+    _ERRATA_REJECTION_OFFSET_HZ_LUT = (
+        7810, 10420, 15620, 20830, 31250, 41670, 0, 0, 0)
+
+    # Settings regs that the chip never changes by itself
+    # and that only write_stngs() writes, so a copy of the last value
+    # written may stand in for reading them back
+    _CACHEABLE_REGS = frozenset((
+        REG_RDO_PA_CFG, REG_RDO_DIOMAP1, REG_RDO_DIOMAP2, REG_LORA_CFG1,
+        REG_LORA_CFG2, REG_LORA_CFG3, REG_LORA_SYNC_WORD))
+
     def __init__(self, spi_cfg, dio_cfg, reset_cfg):
         """Saves config info, opens the SPI bus and init a settings object."""
         assert isinstance(spi_cfg, SpiConfig)
@@ -150,6 +177,9 @@ class SX127x():
         self._reset_cfg = reset_cfg
 
         self._stngs = SX127xSettings()
+        self._reg_cache = {}
+        self._fifo_base = None
+        self._updt_dio_sigs()
 
 # Public
 
@@ -185,7 +215,7 @@ class SX127x():
     def clear_irq_flags(self):
         """Writes the IRQ flags reg back to itself to clear the flags
         """
-        reg = self._read(SX127x.REG_LORA_IRQ_FLAGS)[0]
+        reg = self._read_byte(SX127x.REG_LORA_IRQ_FLAGS)
         self._write(SX127x.REG_LORA_IRQ_FLAGS, reg)
 
 
@@ -213,8 +243,9 @@ class SX127x():
         GPIO.setwarnings(False)
         GPIO.setmode(GPIO.BCM)
         GPIO.setup(self._reset_cfg.pin, GPIO.OUT, initial=GPIO.HIGH)
-        for n, pin_nmbr in enumerate(self._dio_cfg.pins):
-            GPIO.setup(pin_nmbr, GPIO.IN)
+        for pin_nmbr in self._dio_cfg.pins:
+            if pin_nmbr is not None:
+                GPIO.setup(pin_nmbr, GPIO.IN)
 
 
     def open(self, dio_isr_clbk):
@@ -233,6 +264,10 @@ class SX127x():
         spi.mode = 0  # phase=0 and polarity=0
         self.spi = spi
 
+        # Register writes need no read-back, so use the write-only
+        # transfer where spidev has it (v3.3 and later)
+        self._spi_write = getattr(spi, "writebytes2", spi.xfer2)
+
         # Validate SPI communication with a SX127x device
         valid = self._validate_chip()
 
@@ -244,15 +279,18 @@ class SX127x():
         self.write_opmode(SX127x.OPMODE_STBY)
         self._stngs.apply("FLD_RDO_LORA_MODE")
 
-        # Init DIOx pin callbacks
+        # Init DIOx pin callbacks.
+        # Only connected DIOs are watched, so RPi.GPIO
+        # doesn't poll for edges that can never come
         dio_isr_lut = (
             self._dio0_isr, self._dio1_isr, self._dio2_isr, self._dio3_isr,
             self._dio4_isr, self._dio5_isr)
         self._dio_isr_clbk = dio_isr_clbk
         if dio_isr_clbk is not None:
-            for n, pin_nmbr in enumerate(self._dio_cfg.pins):
-                GPIO.add_event_detect(
-                    pin_nmbr, edge=GPIO.RISING, callback=dio_isr_lut[n])
+            for pin_nmbr, dio_isr in zip(self._dio_cfg.pins, dio_isr_lut):
+                if pin_nmbr is not None:
+                    GPIO.add_event_detect(
+                        pin_nmbr, edge=GPIO.RISING, callback=dio_isr)
 
         return valid
 
@@ -264,8 +302,17 @@ class SX127x():
         snr is a float [dB].
         flags is 0 if rx is good, otherwise it is bitwise combo of IRQ_FLAGS_*.
         """
+        # Read the FIFO's RX pkt start, the IRQ flags, the RX byte count,
+        # the pkt SNR and the pkt RSSI with one burst of consecutive regs
+        base = SX127x.REG_LORA_FIFO_CURR_ADDR
+        regs = self._read(base, SX127x.REG_LORA_PKT_RSSI - base + 1)
+        pkt_start = regs[0]
+        reg = regs[SX127x.REG_LORA_IRQ_FLAGS - base]
+        nbytes = regs[SX127x.REG_LORA_RX_CNT - base]
+        snr = regs[SX127x.REG_LORA_PKT_SNR - base]
+        rssi = regs[SX127x.REG_LORA_PKT_RSSI - base]
+
         # Clear rx-related IRQ flags in the reg
-        reg = self._read(SX127x.REG_LORA_IRQ_FLAGS)[0]
         flags = reg & (
             SX127x.IRQ_FLAGS_RXTIMEOUT
             | SX127x.IRQ_FLAGS_RXDONE
@@ -279,18 +326,12 @@ class SX127x():
         if flags:
             good_rx = False
 
-        # Read the packet SNR and RSSI (2 consecutive regs)
-        # and calculate RSSI [dBm] and SNR [dB]
-        snr, rssi = self._read(SX127x.REG_LORA_PKT_SNR, 2)
+        # Calculate RSSI [dBm] and SNR [dB]
         rssi = -157 + rssi
         snr = snr / 4.0
 
         if good_rx:
-            # Read the address of where the pkt starts
-            # and the length of the data received,
-            # then set the pointer and read the packet
-            pkt_start, _, _, nbytes = \
-                self._read(SX127x.REG_LORA_FIFO_CURR_ADDR, 4)
+            # Set the pointer to where the pkt starts and read the packet
             self._write(SX127x.REG_LORA_FIFO_ADDR_PTR, pkt_start)
             payld = self._read(SX127x.REG_RDO_FIFO, nbytes)
         else:
@@ -302,19 +343,23 @@ class SX127x():
     def read_opmode(self):
         """Reads and returns OPMODE from its register
         """
-        return 0x07 & self._read(SX127x.REG_RDO_OPMODE)[0]
+        return 0x07 & self._read_byte(SX127x.REG_RDO_OPMODE)
 
 
     def reset_rdo(self):
         """Resets the radio and internal tracking of radio settings.
         Caller must wait 5ms after calling this to interact with radio SPI.
         """
-        # Toggle the reset pin to reset the SX127x
+        # Toggle the reset pin to reset the SX127x.
+        # The pulse is only ~100 us, which sleep() would overshoot
         GPIO.output(self._reset_cfg.pin, GPIO.LOW)
-        time.sleep(self._reset_cfg.pin_low_time)
+        self._busy_wait(self._reset_cfg.pin_low_time)
         GPIO.output(self._reset_cfg.pin, GPIO.HIGH)
 
         self._stngs.reset()
+        self._reg_cache.clear()
+        self._fifo_base = None
+        self._updt_dio_sigs()
 
 
     def set_fld(self, fld, val):
@@ -349,19 +394,30 @@ class SX127x():
         Use the .noise property to fetch an arbitrary value
         from this noise source.
         """
-        NoiseAccumulator.append(1 & self._read(SX127x.REG_LORA_RSSI_WB)[0])
+        NoiseAccumulator.append(1 & self._read_byte(SX127x.REG_LORA_RSSI_WB))
 
 
     def write_fifo(self, data, sz=None):
         if not bool(sz):
             sz = len(data)
         assert 0 < sz < 256, "Data will not fit in the radio's FIFO"
-        self._write(SX127x.REG_RDO_FIFO, data[:sz])
+        if sz < len(data):
+            data = data[:sz]
+        self._write(SX127x.REG_RDO_FIFO, data)
 
 
     def write_fifo_ptr(self, offset):
+        """Sets the FIFO address pointer to the offset.
+        The FIFO's TX and RX base addresses are also set to the offset
+        (they follow the pointer's register), but only when they
+        aren't already set to it.
+        """
         assert 0 <= offset < 256
-        self._write(SX127x.REG_LORA_FIFO_ADDR_PTR, [offset] * 3)
+        if offset == self._fifo_base:
+            self._write(SX127x.REG_LORA_FIFO_ADDR_PTR, offset)
+        else:
+            self._write(SX127x.REG_LORA_FIFO_ADDR_PTR, [offset] * 3)
+            self._fifo_base = offset
 
 
     def write_lora_irq_flags(self, clear_these):
@@ -369,7 +425,14 @@ class SX127x():
 
 
     def write_lora_irq_mask(self, disable_these, enable_these):
-        reg = self._read(SX127x.REG_LORA_IRQ_MASK)[0]
+        """Disables and enables the given LoRa IRQs
+        (a set bit in the IRQ mask disables that IRQ).
+        The mask is only read back if some IRQs are left as they are.
+        """
+        if (disable_these | enable_these) & 0xFF == 0xFF:
+            reg = 0
+        else:
+            reg = self._read_byte(SX127x.REG_LORA_IRQ_MASK)
         reg |= (disable_these & 0xFF)
         reg &= (~enable_these & 0xFF)
         self._write(SX127x.REG_LORA_IRQ_MASK, reg)
@@ -380,10 +443,7 @@ class SX127x():
 
 
     def write_opmode(self, opmode):
-        reg = self._read(SX127x.REG_RDO_OPMODE)[0]
-        reg &= (~0x7 & 0xFF)
-        reg |= (0x7 & opmode)
-        self._write(SX127x.REG_RDO_OPMODE, reg)
+        self._modify(SX127x.REG_RDO_OPMODE, 0x07, opmode)
 
 
     def write_sleep_settings(self):
@@ -392,94 +452,99 @@ class SX127x():
         """
         if self._stngs.changed("FLD_RDO_LORA_MODE"):
             # RMW to LoRa Mode bit in the OpMode reg
-            reg = self.read_opmode()
             if self._stngs.get("FLD_RDO_LORA_MODE"):
-                reg |= 0x80
+                self._modify(SX127x.REG_RDO_OPMODE, 0x80, 0x80)
             else:
-                reg &= 0x7F
-            self._write(SX127x.REG_RDO_OPMODE, reg)
+                self._modify(SX127x.REG_RDO_OPMODE, 0x80, 0)
             self._stngs.apply("FLD_RDO_LORA_MODE")
 
 
     def write_stng(self, fld):
-        """Writes one setting to its register(s)"""
-        if self._stngs.changed(fld):
-            reg = self._read(SX127xSettings.get_reg(fld))[0]
-            reg = self._stngs.modify(fld, reg)
-            self._write(SX127xSettings.get_reg(fld), reg)
-            self._stngs.apply(fld)
+        """Writes one setting to its register(s).
+        A two-register field's second register is its "_FLD_***_2" field.
+        The carrier freq is written by write_stngs(), not here.
+        """
+        stngs = self._stngs
+        for fld_reg in (fld, "_" + fld + "_2"):
+            if stngs.changed(fld_reg):
+                reg_addr = SX127xSettings.get_reg(fld_reg)
+                self._reg_cache.pop(reg_addr, None)
+                reg = self._read_byte(reg_addr)
+                self._write(reg_addr, stngs.modify(fld_reg, reg))
+                stngs.apply(fld_reg)
+        if fld in SX127x._DIO_FLDS:
+            self._updt_dio_sigs()
 
 
     def write_stngs(self, for_rx):
-        """Writes changed settings to the registers"""
+        """Writes changed settings to the registers.
+
+        Fields in consecutive registers are read-modify-written
+        together with one burst read and one burst write
+        that span only the registers with changed fields.
+        The read is skipped if every register is in the cache
+        and the write is skipped if no register value changes.
+        The carrier freq is written by _write_errata(), not here.
+        """
         assert type(for_rx) is bool
 
         self._write_errata(for_rx)
-        for fld in SX127xSettings.get_field_names():
-            self.write_stng(fld)
+        stngs = self._stngs
+        chngd_flds = stngs.get_changed()
+        if not chngd_flds:
+            return
+        reg_cache = self._reg_cache
+        for reg_start, flds in SX127xSettings.get_reg_groups():
+            chngd = [fld_ent for fld_ent in flds if fld_ent[0] in chngd_flds]
+            if chngd:
+                lo = chngd[0][1]
+                reg_addrs = range(reg_start + lo, reg_start + chngd[-1][1] + 1)
+                prev_regs = [reg_cache.get(reg_addr) for reg_addr in reg_addrs]
+                if None in prev_regs:
+                    prev_regs = self._read(reg_addrs[0], len(reg_addrs))
+                regs = list(prev_regs)
+                stngs.apply_to_regs(regs, lo, chngd)
+                if regs != prev_regs:
+                    self._write(reg_addrs[0], regs)
+                for reg_addr, reg in zip(reg_addrs, regs):
+                    if reg_addr in SX127x._CACHEABLE_REGS:
+                        reg_cache[reg_addr] = reg
+        self._updt_dio_sigs()
 
 
 # Private
 
 
     def _dio0_isr(self, chnl):
-        dio0_to_sig_lut = (
-            SX127x.DIO_RX_DONE,
-            SX127x.DIO_TX_DONE,
-            SX127x.DIO_CAD_DONE,
-        )
-        self._dio_isr_clbk(
-            dio0_to_sig_lut[self._stngs.get_applied("FLD_RDO_DIO0")])
+        self._dio_isr_clbk(self._dio_sigs[0])
 
 
     def _dio1_isr(self, chnl):
-        dio1_to_sig_lut = (
-            SX127x.DIO_RX_TMOUT,
-            SX127x.DIO_FHSS_CHG_CHNL,
-            SX127x.DIO_CAD_DETECTED,
-        )
-        self._dio_isr_clbk(
-            dio1_to_sig_lut[self._stngs.get_applied("FLD_RDO_DIO1")])
+        self._dio_isr_clbk(self._dio_sigs[1])
 
 
     def _dio2_isr(self, chnl):
-        dio2_to_sig_lut = (
-            SX127x.DIO_FHSS_CHG_CHNL,
-            SX127x.DIO_FHSS_CHG_CHNL,
-            SX127x.DIO_FHSS_CHG_CHNL,
-        )
-        self._dio_isr_clbk(
-            dio2_to_sig_lut[self._stngs.get_applied("FLD_RDO_DIO2")])
+        self._dio_isr_clbk(self._dio_sigs[2])
 
 
     def _dio3_isr(self, chnl):
-        dio3_to_sig_lut = (
-            SX127x.DIO_CAD_DONE,
-            SX127x.DIO_VALID_HDR,
-            SX127x.DIO_PAYLD_CRC_ERR,
-        )
-        self._dio_isr_clbk(
-            dio3_to_sig_lut[self._stngs.get_applied("FLD_RDO_DIO3")])
+        self._dio_isr_clbk(self._dio_sigs[3])
 
 
     def _dio4_isr(self, chnl):
-        dio4_to_sig_lut = (
-            SX127x.DIO_CAD_DETECTED,
-            SX127x.DIO_PLL_LOCK,
-            SX127x.DIO_PLL_LOCK,
-        )
-        self._dio_isr_clbk(
-            dio4_to_sig_lut[self._stngs.get_applied("FLD_RDO_DIO4")])
+        self._dio_isr_clbk(self._dio_sigs[4])
 
 
     def _dio5_isr(self, chnl):
-        dio5_to_sig_lut = (
-            SX127x.DIO_MODE_RDY,
-            SX127x.DIO_CLK_OUT,
-            SX127x.DIO_CLK_OUT,
-        )
-        self._dio_isr_clbk(
-            dio5_to_sig_lut[self._stngs.get_applied("FLD_RDO_DIO5")])
+        self._dio_isr_clbk(self._dio_sigs[5])
+
+
+    @staticmethod
+    def _busy_wait(secs):
+        """Spins for the given (short) time without yielding the CPU."""
+        end = time.perf_counter() + secs
+        while time.perf_counter() < end:
+            pass
 
 
     @staticmethod
@@ -489,42 +554,62 @@ class SX127x():
             500000)
         return actual_bw[bw_idx]
 
+    def _modify(self, reg_addr, mask, bits):
+        """Read-modify-writes the masked bits of one register.
+        Makes the write directly, without the checks
+        that _write() does for general use.
+        """
+        reg = self._read_byte(reg_addr)
+        self._spi_write(
+            [reg_addr | 0x80, (reg & ~mask | bits & mask) & 0xFF])
+
+
     def _read(self, reg_addr, nbytes=1):
         """Reads a byte (or more) from the register.
         Returns list of bytes (even if there is only one).
         """
-        assert type(nbytes) is int
-        assert nbytes > 0
-        b = [reg_addr]
-        b.extend([0] * nbytes)
-        return self.spi.xfer2(b)[1:]
+        return self.spi.xfer2([reg_addr] + [0] * nbytes)[1:]
+
+
+    def _read_byte(self, reg_addr):
+        """Reads and returns one byte from the register."""
+        return self.spi.xfer2([reg_addr, 0])[1]
+
+
+    def _updt_dio_sigs(self):
+        """Looks up the signal each DIO gives for the applied DIO mapping.
+        The DIO ISRs just pass on these signals, so this must be called
+        whenever the applied FLD_RDO_DIOx settings may have changed.
+        """
+        get_applied = self._stngs.get_applied
+        self._dio_sigs = tuple(
+            lut[get_applied(fld)]
+            for lut, fld in zip(SX127x._DIO_SIG_LUTS, SX127x._DIO_FLDS))
 
 
     def _validate_chip(self):
         """Returns True if the SX127x chip and the SPI bus are operating.
         """
         CHIP_VRSN = 0x12
-        return CHIP_VRSN == self._read(SX127x.REG_RDO_CHIP_VRSN)[0]
+        return CHIP_VRSN == self._read_byte(SX127x.REG_RDO_CHIP_VRSN)
 
 
     def _write(self, reg_addr, data):
         """Writes one or more bytes to the register.
-        Returns list of bytes (even if there is only one).
+        The data is an int or a sequence of ints (bytes, list or tuple).
         """
-        assert type(data) == int or isinstance(data, collections.abc.Sequence)
-
         # Set the write bit (MSb)
         reg_addr |= 0x80
 
-        # Build the list of bytes to write
-        if type(data) == int:
-            data &= 0xff
-            b = [reg_addr, data]
+        # Build the bytes to write
+        if type(data) is int:
+            b = [reg_addr, data & 0xff]
+        elif type(data) is bytes:
+            b = bytes((reg_addr,)) + data
         else:
-            b = [reg_addr]
-            b.extend(data)
+            b = [reg_addr, *data]
 
-        return self.spi.xfer2(b)[1:]
+        self._spi_write(b)
 
 
     def _write_errata(self, for_rx):
@@ -539,27 +624,21 @@ class SX127x():
                 auto_if_on = True
             else:
                 # Adjust the intermediate freq per errata
-                if_freq2_lut = (
-                    0x48, 0x44, 0x44, 0x44, 0x44, 0x44, 0x40, 0x40, 0x40)
-                reg_if_freq2 = if_freq2_lut[bw]
+                reg_if_freq2 = SX127x._ERRATA_IF_FREQ2_LUT[bw]
                 # Add the rejection offset to the carrier freq
                 # and fill the stngs holding array with that
-                rejection_offset_hz_lut = (
-                    7810, 10420, 15620, 20830, 31250, 41670, 0, 0, 0)
-                freq += rejection_offset_hz_lut[bw]
+                freq += SX127x._ERRATA_REJECTION_OFFSET_HZ_LUT[bw]
 
         # If LoRa mode or LoRa BW has changed,
         # apply the errata values to their regs
         if (self._stngs.changed("FLD_RDO_LORA_MODE")
                 or self._stngs.changed("FLD_LORA_BW")):
             self._write(SX127x.REG_LORA_IF_FREQ_2, reg_if_freq2)
-            reg = self._read(SX127x.REG_LORA_DTCT_OPTMZ)[0]
-            reg &= 0x7F
-            reg |= (0, 0x80)[auto_if_on]
-            self._write(SX127x.REG_LORA_DTCT_OPTMZ, reg)
+            self._modify(SX127x.REG_LORA_DTCT_OPTMZ, 0x80,
+                         0x80 if auto_if_on else 0)
 
         # Write outstanding carrier freq to the regs
-        if freq != self._stngs.get_applied("FLD_RDO_FREQ"):
+        if freq != self._stngs.get_applied_freq():
             # Adjust numerical frequency to register value
             reg_freq = round(freq * 2**19 / SX127x.SX127X_OSC_FREQ)
             regs = [
@@ -568,7 +647,7 @@ class SX127x():
                 (reg_freq >> 0) & 0xFF,     # LSB
             ]
             self._write(SX127x.REG_RDO_FREQ_MSB, regs)
-            self._stngs_freq_applied = freq
+            self._stngs.apply_freq(freq)
 
 
 class SX127xSettings():
@@ -628,11 +707,22 @@ class SX127xSettings():
     STNG_LORA_SF_MIN = 6
     STNG_LORA_SF_MAX = 12
 
-    # Field info named tuple
-    FldInfo = collections.namedtuple(
-        "FldInfo",
-        "lora_mode reg_start reg_cnt bit_start "
-        "bit_cnt val_min val_max val_reset")
+    class FldInfo(collections.namedtuple(
+            "FldInfo",
+            "lora_mode reg_start reg_cnt bit_start "
+            "bit_cnt val_min val_max val_reset mask")):
+        """Field info named tuple.
+        The field's mask within its (first) register is computed
+        once here rather than on every write.
+        """
+        __slots__ = ()
+
+        def __new__(cls, lora_mode, reg_start, reg_cnt, bit_start, bit_cnt,
+                    val_min, val_max, val_reset):
+            mask = (((1 << bit_cnt) - 1) << bit_start) & 0xFF
+            return super().__new__(cls, lora_mode, reg_start, reg_cnt,
+                                   bit_start, bit_cnt, val_min, val_max,
+                                   val_reset, mask)
 
     # Field info table
     _fld_info = {
@@ -659,9 +749,9 @@ class SX127xSettings():
         "FLD_LORA_CRC_EN":          FldInfo( True,   SX127x.REG_LORA_CFG2,           1,      2,      1,      0,                  1,                  0                   ),
         "FLD_LORA_SF":              FldInfo( True,   SX127x.REG_LORA_CFG2,           1,      4,      4,      STNG_LORA_SF_MIN,   STNG_LORA_SF_MAX,   STNG_LORA_SF_128_CPS),
         "FLD_LORA_RX_TMOUT":        FldInfo( True,   SX127x.REG_LORA_CFG2,           2,      0,      2,      0,                  (1<<10)-1,          0x00                ),
-        "_FLD_LORA_RX_TMOUT_2":     FldInfo( 0,      SX127x.REG_LORA_RX_SYM_TMOUT,   0,      0,      0,      0,                  0,                  0x64                ),
+        "_FLD_LORA_RX_TMOUT_2":     FldInfo( True,   SX127x.REG_LORA_RX_SYM_TMOUT,   1,      0,      8,      0,                  (1<<8)-1,           0x64                ),
         "FLD_LORA_PREAMBLE_LEN":    FldInfo( True,   SX127x.REG_LORA_PREAMBLE_LEN,   2,      0,      16,     0,                  (1<<16)-1,          0x00                ),
-        "_FLD_LORA_PREAMBLE_LEN_2": FldInfo( 0,      SX127x.REG_LORA_PREAMBLE_LEN_LSB,0,     0,      0,      0,                  0,                  0x08                ),
+        "_FLD_LORA_PREAMBLE_LEN_2": FldInfo( True,   SX127x.REG_LORA_PREAMBLE_LEN_LSB,1,     0,      8,      0,                  (1<<8)-1,           0x08                ),
         "FLD_LORA_AGC_ON":          FldInfo( True,   SX127x.REG_LORA_CFG3,           1,      2,      1,      0,                  1,                  0                   ),
         "FLD_LORA_SYNC_WORD":       FldInfo( True,   SX127x.REG_LORA_SYNC_WORD,      1,      0,      8,      0,                  (1<<8)-1,           0x12                ),
     }
@@ -669,6 +759,8 @@ class SX127xSettings():
     def __init__(self):
         self._stngs = {}
         self._stngs_applied = {}
+        # Names of the fields whose value differs from the applied one
+        self._chngd = set()
         self.reset()
 
 # Public
@@ -681,6 +773,14 @@ class SX127xSettings():
     def get_reg(cls, fld):
         return cls._fld_info[fld].reg_start
 
+    @classmethod
+    def get_reg_groups(cls):
+        """Returns the fields grouped by runs of consecutive registers.
+        Each group is (reg_start, ((fld, reg_offset, mask, bit_start), ...))
+        with the fields in register order.
+        """
+        return cls._reg_groups
+
     @classmethod
     def get_reset_value(cls, fld):
         return cls._fld_info[fld].val_reset
@@ -691,39 +791,72 @@ class SX127xSettings():
         written to the device register.
         """
         self._stngs_applied[fld] = self._stngs[fld]
+        self._chngd.discard(fld)
 
     def changed(self, fld):
         """Returns True if the setting field differs
         from the one that's applied.
         """
-        return self._stngs[fld] != self._stngs_applied[fld]
+        return fld in self._chngd
+
+    def get_changed(self):
+        """Returns the set of names of the fields that differ
+        from the ones that are applied.
+        """
+        return self._chngd
+
+    def apply_to_regs(self, regs, reg_offset, flds):
+        """Modifies the register values for the given fields
+        and applies the fields.
+        The fields are entries from a group of get_reg_groups()
+        and regs[0] holds the register at reg_offset in that group.
+        """
+        stngs = self._stngs
+        stngs_applied = self._stngs_applied
+        for fld, offset, mask, bit_start in flds:
+            val = stngs[fld]
+            i = offset - reg_offset
+            regs[i] = (regs[i] & ~mask) | ((val << bit_start) & mask)
+            stngs_applied[fld] = val
+            self._chngd.discard(fld)
+
+    def apply_freq(self, freq):
+        """Records the carrier freq written to the device registers.
+        This may differ from the FLD_RDO_FREQ setting
+        by the rejection offset of Errata 2.3.
+        """
+        self._rdo_stngs_freq_applied = freq
+        self.apply("FLD_RDO_FREQ")
 
     def get(self, fld):
-        # Frequency is a special case because it's multi-reg and
-        # is handled specially due to chip errata
-        if fld == "FLD_RDO_FREQ":
-            return self._rdo_stngs_freq
-        else:
-            return self._stngs[fld]
+        return self._stngs[fld]
 
     def get_applied(self, fld):
         return self._stngs_applied[fld]
 
+    def get_applied_freq(self):
+        """Returns the carrier freq written to the device registers."""
+        return self._rdo_stngs_freq_applied
+
     def get_applied_stngs(self):
-        return self._stngs_applied
+        """Returns the applied values of the public fields.
+        The "_FLD_***_2" halves of two-register fields are left out.
+        """
+        return {fld: val for fld, val in self._stngs_applied.items()
+                if not fld.startswith("_")}
 
     def modify(self, fld, val):
         """Modifies the given value to clear out the former bits
         for the given field and put the requested value in their place.
         """
-        # FIXME: for fields that span >1 register
-        if SX127xSettings._fld_info[fld].reg_cnt > 1: return val
+        info = SX127xSettings._fld_info[fld]
+
+        # The carrier freq is written by SX127x._write_errata()
+        if fld == "FLD_RDO_FREQ": return val
 
-        bit_start = self._fld_info[fld].bit_start
-        bitf = self._bit_fld(bit_start,
-                             self._fld_info[fld].bit_cnt)
-        val &= (~bitf & 0xFF)
-        val |= (bitf & (self._stngs[fld] << bit_start))
+        mask = info.mask
+        val &= (~mask & 0xFF)
+        val |= (mask & (self._stngs[fld] << info.bit_start))
         return val
 
 
@@ -732,10 +865,11 @@ class SX127xSettings():
         This should be done after a chip reset
         so this driver is synchronized with the chip.
         """
-        for fld in self.get_field_names():
+        for fld in SX127xSettings._fld_info:
             val = self.get_reset_value(fld)
             self._stngs[fld] = val
             self._stngs_applied[fld] = val
+        self._chngd.clear()
         self._rdo_stngs_freq_applied = 0
 
 
@@ -745,39 +879,57 @@ class SX127xSettings():
         Once all the fields have been set, call write_stngs() to write
         all of the settings to the register(s).
         """
-        minval = SX127xSettings._fld_info[fld].val_min
-        maxval = SX127xSettings._fld_info[fld].val_max
-        assert minval <= val <= maxval, "Invalid value"
-
-        self._stngs[fld] = val
+        info = SX127xSettings._fld_info[fld]
+        assert info.val_min <= val <= info.val_max, "Invalid value"
 
         # Settings special cases for multi-reg values
         if fld == "FLD_RDO_FREQ":
-            assert SX127xSettings._fld_info[fld].reg_cnt == 3
-            # Errata 2.3: store freq so rejection offset may be applied later
-            self._rdo_stngs_freq = val
+            # Errata 2.3: store freq whole so the rejection offset
+            # may be applied when it is written
+            self._store(fld, val)
 
         elif fld == "FLD_LORA_RX_TMOUT":
-            assert SX127xSettings._fld_info[fld].reg_cnt == 2
-            self._stngs["FLD_LORA_RX_TMOUT"] = (val >> 8) & 0xFF
-            self._stngs["_FLD_LORA_RX_TMOUT_2"] = (val >> 0) & 0xFF
+            self._store("FLD_LORA_RX_TMOUT", (val >> 8) & 0xFF)
+            self._store("_FLD_LORA_RX_TMOUT_2", (val >> 0) & 0xFF)
 
         elif fld == "FLD_LORA_PREAMBLE_LEN":
-            assert SX127xSettings._fld_info[fld].reg_cnt == 2
-            self._stngs["FLD_LORA_PREAMBLE_LEN"] = (val >> 8) & 0xFF
-            self._stngs["_FLD_LORA_PREAMBLE_LEN_2"] = (val >> 0) & 0xFF
+            self._store("FLD_LORA_PREAMBLE_LEN", (val >> 8) & 0xFF)
+            self._store("_FLD_LORA_PREAMBLE_LEN_2", (val >> 0) & 0xFF)
 
         # Settings normal case for single-reg values
         else:
-            assert SX127xSettings._fld_info[fld].reg_cnt == 1
-            mask = self._bit_fld(0, SX127xSettings._fld_info[fld].bit_cnt)
-            self._stngs[fld] = val & mask
+            self._store(fld, val & (info.mask >> info.bit_start))
 
 # Private
 
-    def _bit_fld(self, ls1, nbits):
-        """Creates a bitfield per
-        https://stackoverflow.com/questions/8774567/c-macro-to-create-a-bit-mask-possible-and-have-i-found-a-gcc-bug
+    def _store(self, fld, val):
+        """Stores the field's value and tracks whether it needs writing."""
+        self._stngs[fld] = val
+        if val != self._stngs_applied.get(fld):
+            self._chngd.add(fld)
+        else:
+            self._chngd.discard(fld)
+
+    @classmethod
+    def _group_regs(cls):
+        """Groups the field names by runs of consecutive registers.
+        The second register of a two-register field is its own
+        "_FLD_***_2" field, so it is grouped like any other.
         """
-        assert nbits <= 8
-        return ((0xFF >> (7 - ((ls1) + (nbits) - 1))) & ~((1 << (ls1)) - 1))
+        groups = []
+        for fld in sorted(cls._fld_info, key=cls.get_reg):
+            info = cls._fld_info[fld]
+            reg = info.reg_start
+            # The freq regs are written by SX127x._write_errata()
+            mask = 0 if fld == "FLD_RDO_FREQ" else info.mask
+            if groups:
+                reg_start, flds = groups[-1]
+                # Same or next register as the last field continues the run
+                if reg - reg_start <= flds[-1][1] + 1:
+                    flds.append((fld, reg - reg_start, mask, info.bit_start))
+                    continue
+            groups.append((reg, [(fld, 0, mask, info.bit_start)]))
+        return tuple((reg, tuple(flds)) for reg, flds in groups)
+
+
+SX127xSettings._reg_groups = SX127xSettings._group_regs()
@@ -2,7 +2,8 @@
 Copyright 2020 Dean Hall.  See LICENSE for details.
 """
 
-import bisect
+import collections
+import heapq
 import logging
 import time
 
@@ -40,6 +41,9 @@ class SX127xHsm(farc.Ahsm):
         self._rx_stngs = {}
         self._tx_stngs = {}
 
+        # The event loop's clock, bound once
+        self._now = farc.Framework._event_loop.time
+
 
     def get_stngs(self):
         """Returns the current settings"""
@@ -55,7 +59,7 @@ class SX127xHsm(farc.Ahsm):
             listen-by-default.  Use set_dflt_rx_clbk() once, instead."""
         # Convert NOW to an actual time
         if rx_time == SX127xHsm.TM_NOW:
-            rx_time = farc.Framework._event_loop.time()
+            rx_time = self._now()
         # The order MUST begin: (action, stngs, ...)
         rx_action = ("rx", rx_stngs, rx_durxn, rx_clbk)
         self.post_fifo(farc.Event(farc.Signal._PHY_RQST, (rx_time, rx_action)))
@@ -68,7 +72,7 @@ class SX127xHsm(farc.Ahsm):
         assert type(tx_bytes) is bytes
         # Convert NOW to an actual time
         if tx_time == SX127xHsm.TM_NOW:
-            tx_time = farc.Framework._event_loop.time()
+            tx_time = self._now()
         # The order MUST begin: (action, stngs, ...)
         tx_action = ("tx", tx_stngs, tx_bytes)
         self.post_fifo(farc.Event(farc.Signal._PHY_RQST, (tx_time, tx_action)))
@@ -137,6 +141,18 @@ class SX127xHsm(farc.Ahsm):
         self.tmout_evt = farc.TimeEvent("_PHY_TMOUT")
         self.prdc_evt = farc.TimeEvent("_PHY_PRDC")
 
+        # Signal numbers the states compare against, looked up once
+        # because each farc.Signal attribute access is a registry lookup
+        self._sig_entry = farc.Signal.ENTRY
+        self._sig_exit = farc.Signal.EXIT
+        self._sig_phy_rqst = farc.Signal._PHY_RQST
+        self._sig_phy_tmout = self.tmout_evt.signal
+        self._sig_phy_prdc = self.prdc_evt.signal
+        self._sig_dio_rx_tmout = farc.Signal._DIO_RX_TMOUT
+        self._sig_dio_rx_done = farc.Signal._DIO_RX_DONE
+        self._sig_dio_valid_hdr = farc.Signal._DIO_VALID_HDR
+        self._sig_dio_tx_done = farc.Signal._DIO_TX_DONE
+
         return self.tran(self._initializing)
 
 
@@ -152,12 +168,16 @@ class SX127xHsm(farc.Ahsm):
         and periodically retries opening the SX127x.
         """
         sig = event.signal
-        if sig == farc.Signal.ENTRY:
+        if sig == self._sig_entry:
             logging.debug("PHY._initializing")
             # Init data
-            # A time-sorted queue (oldest-on-the-left) to hold actions
-            # to perform on the radio
+            # A time-ordered heap of (time, seq, action) to hold actions
+            # to perform on the radio.  The sequence number keeps actions
+            # with equal times in the order they were enqueued.
             self._tm_queue = []
+            self._tm_seq = 0
+            # A FIFO of (time, action) for actions that jump the queue
+            self._im_queue = collections.deque()
 
             self._sx127x.init_gpio()
             self._sx127x.reset_rdo()
@@ -165,7 +185,7 @@ class SX127xHsm(farc.Ahsm):
                                    self._sx127x._reset_cfg.after_reset_wait)
             return self.handled(event)
 
-        elif sig == farc.Signal._PHY_TMOUT:
+        elif sig == self._sig_phy_tmout:
             if self._sx127x.open(self._dio_isr_clbk):
                 assert len(self._base_stngs) > 0, \
                     "Base settings must be set before initializing"
@@ -177,7 +197,7 @@ class SX127xHsm(farc.Ahsm):
             self.tmout_evt.post_in(self, 1.0)
             return self.handled(event)
 
-        elif sig == farc.Signal.EXIT:
+        elif sig == self._sig_exit:
             self.tmout_evt.disarm()
             return self.handled(event)
 
@@ -192,7 +212,7 @@ class SX127xHsm(farc.Ahsm):
         transitions to _txing, _sleeping or _listening
         """
         sig = event.signal
-        if sig == farc.Signal.ENTRY:
+        if sig == self._sig_entry:
             logging.debug("PHY._scheduling")
             if SX127x.OPMODE_STBY == self._sx127x.read_opmode():
                 delay = 0.0
@@ -201,7 +221,7 @@ class SX127xHsm(farc.Ahsm):
             self.tmout_evt.post_in(self, delay)
             return self.handled(event)
 
-        elif sig == farc.Signal._PHY_TMOUT:
+        elif sig == self._sig_phy_tmout:
             if SX127x.OPMODE_STBY != self._sx127x.read_opmode():
                 self.tmout_evt.post_in(self, 0.010)
                 return self.handled(event)
@@ -211,13 +231,8 @@ class SX127xHsm(farc.Ahsm):
             self._default_action = not bool(next_action)
             if next_action:
                 _, action = next_action
-                if action[0] == "rx":
-                    st = self._listening
-                elif action[0] == "tx":
-                    st = self._txing
-                else:
-                    # Placeholder for CAD, sleep
-                    assert False, "Got here by accident"
+                # Placeholder: CAD and sleep actions have no state yet
+                st = SX127xHsm._ACTION_STATES[action[0]]
 
             # Otherwise, go to the default
             elif self._lstn_by_dflt:
@@ -227,7 +242,7 @@ class SX127xHsm(farc.Ahsm):
 
             return self.tran(st)
 
-        elif sig == farc.Signal._PHY_RQST:
+        elif sig == self._sig_phy_rqst:
             tm, action = event.value
             self._enqueue_action(tm, action)
             return self.handled(event)
@@ -245,11 +260,11 @@ class SX127xHsm(farc.Ahsm):
         to exit to go handle the next action.
         """
         sig = event.signal
-        if sig == farc.Signal.ENTRY:
+        if sig == self._sig_entry:
             logging.debug("PHY._lingering")
             return self.handled(event)
 
-        elif sig == farc.Signal._PHY_RQST:
+        elif sig == self._sig_phy_rqst:
             tm, action = event.value
             self._enqueue_action(tm, action)
             # If lingering because of default action
@@ -260,10 +275,10 @@ class SX127xHsm(farc.Ahsm):
             # remain in current state
             return self.handled(event)
 
-        elif sig == farc.Signal._PHY_TMOUT:
+        elif sig == self._sig_phy_tmout:
             return self.tran(self._scheduling)
 
-        elif sig == farc.Signal.EXIT:
+        elif sig == self._sig_exit:
             self.tmout_evt.disarm()
             self._sx127x.write_opmode(SX127x.OPMODE_STBY)
             return self.handled(event)
@@ -280,7 +295,7 @@ class SX127xHsm(farc.Ahsm):
         Transitions to _rxing if a valid header is received.
         """
         sig = event.signal
-        if sig == farc.Signal.ENTRY:
+        if sig == self._sig_entry:
             logging.debug("PHY._listening")
             action = self._pop_soon_action()
             stngs = self._base_stngs.copy()
@@ -324,7 +339,7 @@ class SX127xHsm(farc.Ahsm):
             else:
                 # Perform a short blocking sleep until rx_time
                 # to obtain more accurate rx execution time on Linux.
-                now = farc.Framework._event_loop.time()
+                now = self._now()
                 tiny_sleep = rx_time - now
                 if tiny_sleep < 0:
                     logging.debug("negative sleep, increase _TM_SVC_MARGIN")
@@ -339,24 +354,24 @@ class SX127xHsm(farc.Ahsm):
                     self.tmout_evt.post_in(self, rx_durxn)
             return self.handled(event)
 
-        elif sig == farc.Signal._PHY_PRDC:
+        elif sig == self._sig_phy_prdc:
             self._sx127x.updt_noise()
             return self.handled(event)
 
-        elif sig == farc.Signal._DIO_VALID_HDR:
+        elif sig == self._sig_dio_valid_hdr:
             self._rxd_hdr_time = event.value
             return self.tran(self._rxing)
 
-        elif sig == farc.Signal._DIO_RX_DONE:
+        elif sig == self._sig_dio_rx_done:
             self._on_lora_rx_done()
             return self.tran(self._scheduling)
 
-        elif sig == farc.Signal._DIO_RX_TMOUT:
+        elif sig == self._sig_dio_rx_tmout:
             logging.info("PHY:_listening@_DIO_RX_TMOUT")
             # TODO: incr phy_data stats rx tmout
             return self.tran(self._scheduling)
 
-        elif sig == farc.Signal.EXIT:
+        elif sig == self._sig_exit:
             self.prdc_evt.disarm()
             return self.handled(event)
 
@@ -372,11 +387,11 @@ class SX127xHsm(farc.Ahsm):
         Transitions to _scheduling after reception ends.
         """
         sig = event.signal
-        if sig == farc.Signal.ENTRY:
+        if sig == self._sig_entry:
             logging.debug("PHY._rxing")
             return self.handled(event)
 
-        elif sig == farc.Signal._PHY_RQST:
+        elif sig == self._sig_phy_rqst:
             # Overrides _lingering's _PHY_RQST handler because we want to
             # remain in this state even if we were listening-by-default
             tm, action = event.value
@@ -395,7 +410,7 @@ class SX127xHsm(farc.Ahsm):
         by the parent state, _lingering()
         """
         sig = event.signal
-        if sig == farc.Signal.ENTRY:
+        if sig == self._sig_entry:
             logging.debug("PHY._sleeping")
             self._sx127x.write_opmode(SX127x.OPMODE_SLEEP)
             return self.handled(event)
@@ -412,7 +427,7 @@ class SX127xHsm(farc.Ahsm):
         then transitions to the _scheduling state.
         """
         sig = event.signal
-        if sig == farc.Signal.ENTRY:
+        if sig == self._sig_entry:
             logging.debug("PHY._txing")
             (tx_time, (_, tx_stngs, tx_bytes)) = self._pop_soon_action()
 
@@ -437,7 +452,7 @@ class SX127xHsm(farc.Ahsm):
             self._sx127x.write_lora_payld_len(len(tx_bytes))
 
             # Blocking sleep until tx_time (assuming a short amount)
-            now = farc.Framework._event_loop.time()
+            now = self._now()
             tiny_sleep = tx_time - now
             if tiny_sleep > SX127xHsm._TM_BLOCKING_MAX:
                 tiny_sleep = SX127xHsm._TM_BLOCKING_MAX
@@ -453,22 +468,22 @@ class SX127xHsm(farc.Ahsm):
             self._sx127x.write_opmode(SX127x.OPMODE_TX)
             return self.handled(event)
 
-        elif sig == farc.Signal._DIO_TX_DONE:
+        elif sig == self._sig_dio_tx_done:
             self._sx127x.write_lora_irq_flags(SX127x.IRQ_FLAGS_TXDONE)
             # TODO: phy stats TX_DONE
             return self.tran(self._scheduling)
 
-        elif sig == farc.Signal._PHY_RQST:
+        elif sig == self._sig_phy_rqst:
             tm, action = event.value
             self._enqueue_action(tm, action)
             return self.handled(event)
 
-        elif sig == farc.Signal._PHY_TMOUT:
+        elif sig == self._sig_phy_tmout:
             logging.warning("PHY._txing@_PHY_TMOUT")
             self._sx127x.write_opmode(SX127x.OPMODE_STBY)
             return self.tran(self._scheduling)
 
-        elif sig == farc.Signal.EXIT:
+        elif sig == self._sig_exit:
             self.tmout_evt.disarm()
             return self.handled(event)
 
@@ -504,16 +519,19 @@ class SX127xHsm(farc.Ahsm):
         corresponding to the DIO pin that transitioned.
         The pin edge's arrival time is the value of the Event.
         """
-        now = farc.Framework._event_loop.time()
+        now = self._now()
         self.post_fifo(farc.Event(self._dio_sig_lut[dio], now))
 
 
     def _enqueue_action(self, tm, action_args):
         """Enqueues the action at the given time"""
+        if tm == SX127xHsm.TM_IMMEDIATE:
+            self._im_queue.append((tm, action_args))
+            return
         if tm == SX127xHsm.TM_NOW:
-            tm = farc.Framework._event_loop.time()
-        tm_action = (tm, action_args)
-        bisect.insort_right(self._tm_queue, tm_action)
+            tm = self._now()
+        self._tm_seq += 1
+        heapq.heappush(self._tm_queue, (tm, self._tm_seq, action_args))
 
 
     def _on_lora_rx_done(self):
@@ -541,12 +559,14 @@ class SX127xHsm(farc.Ahsm):
 
         Returns None if the queue is empty.
         """
+        if self._im_queue:
+            return self._im_queue.popleft()
         if self._tm_queue:
-            tm_action = self._tm_queue[0]
-            now = farc.Framework._event_loop.time()
-            if tm_action[0] < now + SX127xHsm._TM_SOON:
-                del self._tm_queue[0]
-                return tm_action
+            tm = self._tm_queue[0][0]
+            now = self._now()
+            if tm < now + SX127xHsm._TM_SOON:
+                _, _, action = heapq.heappop(self._tm_queue)
+                return (tm, action)
         return None
 
 
@@ -555,9 +575,18 @@ class SX127xHsm(farc.Ahsm):
 
         Returns None if the queue is empty.
         """
+        if self._im_queue:
+            return self._im_queue[0]
         if self._tm_queue:
-            tm_action = self._tm_queue[0]
-            now = farc.Framework._event_loop.time()
-            if tm_action[0] < now + SX127xHsm._TM_SOON:
-                return tm_action
+            tm, _, action = self._tm_queue[0]
+            now = self._now()
+            if tm < now + SX127xHsm._TM_SOON:
+                return (tm, action)
         return None
+
+
+# The state that performs each kind of action, by the action's name
+SX127xHsm._ACTION_STATES = {
+    "rx": SX127xHsm._listening,
+    "tx": SX127xHsm._txing,
+}
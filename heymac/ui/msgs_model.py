@@ -30,7 +30,7 @@ class MsgsModel():
         # TODO: blink status RX indicator
         if isinstance(hm_frame.cmd, HeymacCmdBcn):
             saddr = hm_frame.saddr
-            callsign = hm_frame.cmd.get_field(HeymacCmdBcn.FLD_CALLSIGN_SSID)
+            callsign = hm_frame.cmd.callsign_ssid
             self._callsigns[saddr] = callsign
 
         elif isinstance(hm_frame.cmd, HeymacCmdTxt):
@@ -32,6 +32,36 @@ class TestHeyMacFrame(unittest.TestCase):
         self.assertRaises(HeymacFrameError, HeymacFrame.parse, b)
 
 
+    def test_parse_buffers(self):
+        b = b"\xE4\x04\xc1\xc2"
+        for frame_bytes in (bytearray(b), memoryview(b), list(b)):
+            f = HeymacFrame.parse(frame_bytes)
+            self.assertEqual(f.saddr, b"\xc1\xc2")
+            self.assertIs(type(f.saddr), bytes)
+
+
+    def test_parse_not_bytes(self):
+        self.assertRaises(HeymacFrameError, HeymacFrame.parse, [0xE4, 256])
+        self.assertRaises(HeymacFrameError, HeymacFrame.parse, [0xE4, -1])
+
+
+    def test_parse_many(self):
+        buf = b"\xE4\x00" + b"\xE4\x04\xc1\xc2" + b"\xE4\x10\xd1\xd2"
+        frames = HeymacFrame.parse_many(buf, (0, 2, 6))
+        self.assertEqual(len(frames), 3)
+        self.assertEqual(frames[0].fctl, 0)
+        self.assertEqual(frames[1].saddr, b"\xc1\xc2")
+        self.assertEqual(frames[2].daddr, b"\xd1\xd2")
+
+
+    def test_parse_long_no_addr(self):
+        self.assertRaises(HeymacFrameError, HeymacFrame.parse, b"\xE4\x40")
+
+
+    def test_parse_short(self):
+        self.assertRaises(HeymacFrameError, HeymacFrame.parse, b"\xE4\x04\xc1")
+
+
     def test_csma(self):
         f = HeymacFrame(HeymacFramePidType.CSMA)
         b = bytes(f)
@@ -156,6 +186,54 @@ class TestHeyMacFrame(unittest.TestCase):
         self.assertRaises(HeymacFrameError, self._test_invalid_field)
 
 
+    def test_mic_field(self):
+        f = HeymacFrame(HeymacFramePidType.CSMA, mic=b"\x01\x02")
+        self.assertEqual(f.mic, b"\x01\x02")
+
+
+    def test_rx_attrs(self):
+        f = HeymacFrame.parse(b"\xE4\x00")
+        self.assertIsNone(f.cmd)
+        self.assertIsNone(f.rx_time)
+        self.assertIsNone(f.rx_rssi)
+        self.assertIsNone(f.rx_snr)
+        self.assertRaises(AttributeError, setattr, f, "timmy", b"timmy")
+
+
+    def test_too_large(self):
+        f = HeymacFrame(HeymacFramePidType.CSMA,
+                        saddr=b"\xc1\xc2",
+                        payld=b"\x00" * 252)
+        self.assertEqual(len(bytes(f)), HeymacFrame.MAX_LEN)
+        f.payld = b"\x00" * 253
+        self.assertRaises(HeymacFrameError, bytes, f)
+
+
+    def test_unequal_addr_lens(self):
+        f = HeymacFrame(HeymacFramePidType.CSMA,
+                        daddr=b"\xd1\xd2",
+                        saddr=b"\xc1\xc2\xc3\xc4\xc5\xc6\xc7\xc8")
+        self.assertRaises(HeymacFrameError, bytes, f)
+
+
+    def test_invalid_payld(self):
+        # A beacon command that is too short
+        self.assertRaises(HeymacFrameError, HeymacFrame.parse, b"\xE4\x00\x82\x00")
+        # A UDP datagram with a bad header
+        self.assertRaises(HeymacFrameError, HeymacFrame.parse, b"\xE4\x00\xD7\xF0")
+
+
+    def test_bytes_kept(self):
+        f = HeymacFrame(HeymacFramePidType.CSMA, saddr=b"\xc1\xc2")
+        b = bytes(f)
+        self.assertIs(bytes(f), b)
+        f.taddr = b"\xe1\xe2"
+        self.assertEqual(bytes(f), b"\xE4\x06\xc1\xc2\xe1\xe2")
+
+        f = HeymacFrame.parse(b)
+        self.assertIs(bytes(f), b)
+
+
     def test_hie(self):
         f = HeymacFrame(HeymacFramePidType.CSMA,
                         ies=HeymacIeSequence(
@@ -212,5 +290,60 @@ class TestHeyMacFrame(unittest.TestCase):
         self.assertEqual(avail1, avail2 + len(ies))
 
 
+    def test_available_payld_sz_long_addrs(self):
+        f = HeymacFrame(HeymacFramePidType.CSMA,
+                        netid=b"\x80\xA5",
+                        daddr=b"\xd1\xd2\xd3\xd4\xd5\xd6\xd7\xd8",
+                        saddr=b"\xc1\xc2\xc3\xc4\xc5\xc6\xc7\xc8")
+        self.assertEqual(f.available_payld_sz(), 255 - 2 - 2 - 8 - 8)
+
+
+
+class TestHeymacFrameSlice(unittest.TestCase):
+    """Tests the HeymacFrameSlice view of frame bytes.
+    """
+
+    def test_min(self):
+        fs = HeymacFrameSlice.slice(b"\xE4\x00")
+        self.assertEqual(fs.pid, 0xE4)
+        self.assertEqual(fs.fctl, 0)
+        self.assertIsNone(fs.netid)
+        self.assertIsNone(fs.daddr)
+        self.assertIsNone(fs.saddr)
+        self.assertIsNone(fs.payld)
+        self.assertIsNone(fs.taddr)
+
+
+    def test_fields(self):
+        f = HeymacFrame(HeymacFramePidType.CSMA,
+                        netid=b"\x80\xA5",
+                        daddr=b"\xd1\xd2\xd3\xd4\xd5\xd6\xd7\xd8",
+                        saddr=b"\xc1\xc2\xc3\xc4\xc5\xc6\xc7\xc8",
+                        payld=HeymacCmdNgbrData(ngbr_lnk_addr=b"\xfe" * 8),
+                        taddr=b"\xe1\xe2\xe3\xe4\xe5\xe6\xe7\xe8")
+        fs = HeymacFrameSlice.slice(bytes(f))
+        self.assertEqual(fs.netid, f.netid)
+        self.assertEqual(fs.daddr, f.daddr)
+        self.assertEqual(fs.saddr, f.saddr)
+        self.assertEqual(fs.payld, bytes(f.payld))
+        self.assertEqual(fs.taddr, f.taddr)
+        self.assertEqual(fs.get_sender(), f.taddr)
+        self.assertEqual(fs.to_frame().daddr, f.daddr)
+
+
+    def test_ies(self):
+        # PIeFrag0(500, 21), PIeTerm
+        ies = b"\xA1\x3E\x95\x20"
+        fs = HeymacFrameSlice.slice(b"\xE4\x0C" + ies + b"\xc1\xc2")
+        self.assertEqual(fs.ies, ies)
+        self.assertEqual(fs.saddr, b"\xc1\xc2")
+        self.assertEqual(fs.get_sender(), b"\xc1\xc2")
+
+
+    def test_not_mac(self):
+        self.assertRaises(HeymacFrameError, HeymacFrameSlice.slice, b"\x00\x00")
+        self.assertRaises(HeymacFrameError, HeymacFrameSlice.slice, b"\xE4\x04")
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 
+import copy
 import unittest
 
 from heymac.lnk import *
@@ -65,6 +66,59 @@ class TestHeyMacCmd(unittest.TestCase):
         c = HeymacCmd.parse(b)
         self.assertIs(type(c), HeymacCmdUnknown)
 
+    def test_unknown_prefix(self):
+        b = b"\xc2\x11\x22"
+        c = HeymacCmd.parse(b)
+        self.assertIs(type(c), HeymacCmdUnknown)
+
+    def test_empty(self):
+        with self.assertRaises(HeymacCmdError):
+            _ = HeymacCmd.parse(b"")
+
+    def test_unknown_sub_id(self):
+        b = b"\x85\x3f\x22"
+        c = HeymacCmd.parse(b)
+        self.assertIs(type(c), HeymacCmdUnknown)
+
+    def test_join_rqst(self):
+        c = HeymacCmd.parse(b"\x85\x01\x12\x34")
+        self.assertIs(type(c), HeymacCmdJoinRqst)
+        self.assertEqual(c.net_id, 0x1234)
+
+    def test_join_acpt(self):
+        c = HeymacCmdJoinAcpt(net_id=0x1234, net_addr=0x5678)
+        b = bytes(c)
+        self.assertEqual(b, b"\x85\x02\x12\x34\x56\x78")
+        c = HeymacCmd.parse(b)
+        self.assertIs(type(c), HeymacCmdJoinAcpt)
+        self.assertEqual(c.net_addr, 0x5678)
+
+    def test_fld_read_only(self):
+        c = HeymacCmdJoinAcpt(net_id=0x1234, net_addr=0x5678)
+        with self.assertRaises(AttributeError):
+            c.net_id = 0x4321
+
+    def test_join_rjct(self):
+        b = bytes(HeymacCmdJoinRjct())
+        self.assertEqual(b, b"\x85\x04")
+        self.assertIs(type(HeymacCmd.parse(b)), HeymacCmdJoinRjct)
+
+    def test_duplicate_cmd_id(self):
+        with self.assertRaises(HeymacCmdError):
+            class _DupBcn(HeymacCmd):
+                _CMD_ID = HeymacCmdBcn._CMD_ID
+        with self.assertRaises(HeymacCmdError):
+            class _DupJoin(HeymacCmd):
+                _CMD_ID = HeymacCmdJoinRqst._CMD_ID
+                _SUB_ID = HeymacCmdJoinRqst._SUB_ID
+        self.assertIs(HeymacCmd._CMD_CLASSES[0x82], HeymacCmdBcn)
+
+    def test_copy(self):
+        c = copy.copy(HeymacCmdJoinRqst(net_id=0x1234))
+        self.assertEqual(c.net_id, 0x1234)
+        with self.assertRaises(AttributeError):
+            _ = c.net_addr
+
     def test_ngbr_data1a(self):
         c = HeymacCmdNgbrData(ngbr_lnk_addr=b"\xfe\x02\x03\x04\x05\x05\x07\x08")
         b = bytes(c)
@@ -72,6 +126,18 @@ class TestHeyMacCmd(unittest.TestCase):
         c = HeymacCmd.parse(b)
         self.assertIsInstance(c, HeymacCmdNgbrData)
 
+    def test_bcn_wrong_size(self):
+        c = HeymacCmdBcn(
+            caps=0x0102,
+            status=0x0304,
+            callsign_ssid=b"EX4MPL-227",
+            pub_key=PUB_KEY)
+        b = bytes(c)
+        with self.assertRaises(HeymacCmdError):
+            _ = HeymacCmd.parse(b[:-1])
+        with self.assertRaises(HeymacCmdError):
+            _ = HeymacCmd.parse(b + b"\x00")
+
     def test_ngbr_data1b(self):
         c = HeymacCmdNgbrData()
         c.append(ngbr_lnk_addr=b"\xfe\x02\x03\x04\x05\x05\x07\x08")
@@ -95,6 +161,35 @@ class TestHeyMacCmd(unittest.TestCase):
         c = HeymacCmd.parse(b)
         self.assertIsInstance(c, HeymacCmdNgbrData)
 
+    def test_ngbr_data_parse_entries(self):
+        addrs = [bytes(range(i, i + 8)) for i in range(3)]
+        c = HeymacCmd.parse(b"\x84\x03" + b"".join(addrs))
+        self.assertEqual(len(c), 3)
+        self.assertEqual([n.ngbr_lnk_addr for n in c], addrs)
+        self.assertEqual(bytes(c), b"\x84\x03" + b"".join(addrs))
+
+    def test_ngbr_data_parse_many(self):
+        addrs = [bytes((i,)) * 8 for i in range(32)]
+        b = b"\x84\x20" + b"".join(addrs)
+        c = HeymacCmd.parse(b)
+        self.assertEqual(len(c), 32)
+        self.assertEqual(c[31].ngbr_lnk_addr, addrs[31])
+        self.assertEqual(bytes(c), b)
+
+    def test_ngbr_data_parse_wrong_cnt(self):
+        with self.assertRaises(HeymacCmdError):
+            _ = HeymacCmd.parse(b"\x84\x02" + bytes(8))
+
+    def test_ngbr_data_parse_partial_entry(self):
+        with self.assertRaises(HeymacCmdError):
+            _ = HeymacCmd.parse(b"\x84\x01" + bytes(7))
+        with self.assertRaises(HeymacCmdError):
+            _ = HeymacCmd.parse(b"\x84")
+
+    def test_ngbr_data_parse_empty(self):
+        c = HeymacCmd.parse(b"\x84\x00")
+        self.assertEqual(len(c), 0)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -81,6 +81,20 @@ class TestHeyMacIe(unittest.TestCase):
         self.assertEqual(ie._mic_algo, 5)
         self.assertEqual(ie._mic_sz, 4)
 
+
+    def test_unknown(self):
+        with self.assertRaises(HeymacIeError):
+            _ = HeymacIe.parse(b"\x3F\x00\x00")
+        with self.assertRaises(HeymacIeError):
+            _ = HeymacIe.parse(b"")
+
+
+    def test_short_u16_value(self):
+        with self.assertRaises(HeymacIeError):
+            _ = HeymacIe.parse(b"\x81\x00")
+        with self.assertRaises(HeymacIeError):
+            _ = HeymacIe.parse(b"\xA3\x05")
+
     # TODO: unhappy cases
     # with self.assertRaises(HeymacCmdError):
     #     _ = HeymacCmdTxt()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+
+
+import unittest
+
+import farc
+
+from heymac.lnk import *
+from heymac.lnk.heymac_link import HeymacLink
+
+
+PUB_KEY = bytes(range(96))
+MY_ADDR = b"\x01\x02\x03\x04\x05\x06\x07\x08"
+NGBR_ADDR = b"\xf1\xf2\xf3\xf4\xf5\xf6\xf7\xf8"
+
+
+def _rxd_frame(saddr, rx_time, payld=None):
+    """Returns a frame as if it were received from the PHY."""
+    f = HeymacFrame(HeymacFramePidType.CSMA, saddr=saddr)
+    f.payld = payld
+    f.cmd = payld
+    f.rx_time = rx_time
+    f.rx_rssi = -90
+    f.rx_snr = 5.0
+    return f
+
+
+class TestHeymacLink(unittest.TestCase):
+    """Tests the HeymacLink neighbor data."""
+
+    def setUp(self):
+        self.now = farc.Framework._event_loop.time()
+        self.lnk = HeymacLink(MY_ADDR)
+
+    def test_process_frame(self):
+        self.lnk.process_frame(_rxd_frame(NGBR_ADDR, self.now))
+        self.assertIn(NGBR_ADDR, self.lnk.get_ngbrs_lnk_addrs())
+
+    def test_process_frame_short_addr(self):
+        self.lnk.process_frame(_rxd_frame(b"\x12\x34", self.now))
+        self.assertIn(b"\x12\x34", self.lnk.get_ngbrs_lnk_addrs())
+
+    def test_process_frame_short_and_long_addr(self):
+        long_addr = bytes(6) + b"\x12\x34"
+        self.lnk.process_frame(_rxd_frame(b"\x12\x34", self.now))
+        self.lnk.process_frame(_rxd_frame(long_addr, self.now))
+        self.assertEqual(len(self.lnk.get_ngbrs_lnk_addrs()), 2)
+
+    def test_process_frame_no_sender(self):
+        f = HeymacFrame.parse(b"\xE4\x00")
+        f.rx_time = self.now
+        f.rx_rssi = -90
+        f.rx_snr = 5.0
+        self.lnk.process_frame(f)
+        self.assertEqual(len(self.lnk.get_ngbrs_lnk_addrs()), 0)
+
+    def test_process_bcns(self):
+        bcn = HeymacCmdBcn(caps=0, status=0,
+                           callsign_ssid=b"EX4MPL-227", pub_key=PUB_KEY)
+        self.lnk.process_frame(_rxd_frame(NGBR_ADDR, self.now, bcn))
+        self.lnk.process_frame(_rxd_frame(NGBR_ADDR, self.now, bcn))
+        self.assertEqual(self.lnk._ngbrs[NGBR_ADDR]["BCN_CNT"], 2)
+
+    def test_process_bcns_keeps_rx_meta(self):
+        bcn = HeymacCmdBcn(caps=0, status=0,
+                           callsign_ssid=b"EX4MPL-227", pub_key=PUB_KEY)
+        self.lnk.process_frame(_rxd_frame(NGBR_ADDR, self.now - 1, bcn))
+        self.lnk.process_frame(_rxd_frame(NGBR_ADDR, self.now, bcn))
+        ngbr_data = self.lnk._ngbrs[NGBR_ADDR]
+        self.assertEqual(ngbr_data["LATEST_RX_TM"], self.now)
+        self.assertEqual(ngbr_data["LATEST_RX_RSSI"], -90)
+        self.assertEqual(ngbr_data["LATEST_RX_SNR"], 5.0)
+
+    def test_update_keeps_fresh_ngbr(self):
+        self.lnk.process_frame(_rxd_frame(NGBR_ADDR, self.now))
+        self.lnk.update()
+        self.assertIn(NGBR_ADDR, self.lnk.get_ngbrs_lnk_addrs())
+
+    def test_update_prunes_expired_ngbr(self):
+        old = self.now - 2 * HeymacLink._EXPIRATION_PRD
+        self.lnk.process_frame(_rxd_frame(NGBR_ADDR, old))
+        self.lnk.update()
+        self.assertNotIn(NGBR_ADDR, self.lnk.get_ngbrs_lnk_addrs())
+
+    def test_update_keeps_reheard_ngbr(self):
+        old = self.now - 2 * HeymacLink._EXPIRATION_PRD
+        self.lnk.process_frame(_rxd_frame(NGBR_ADDR, old))
+        self.lnk.process_frame(_rxd_frame(NGBR_ADDR, self.now))
+        self.lnk.update()
+        self.assertIn(NGBR_ADDR, self.lnk.get_ngbrs_lnk_addrs())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -65,6 +65,12 @@ class TestAPv6Packet(unittest.TestCase):
         with self.assertRaises(APv6PacketError):
             p = APv6Packet(hops=999)
 
+    def test_addr_wrong_len(self):
+        with self.assertRaises(APv6PacketError):
+            _ = APv6Packet(saddr=b"\x10\x11")
+        with self.assertRaises(APv6PacketError):
+            _ = APv6Packet(daddr=bytes(17))
+
 
     def test_saddr(self):
         p = APv6Packet(saddr=b"\x10\x11\x12\x13\x14\x15\x16\x17\x18\x19\x1a\x1b\x1c\x1d\x1e\x1f")
@@ -113,6 +119,40 @@ class TestAPv6Packet(unittest.TestCase):
         self.assertEqual(p.saddr, b"\x10\x11\x12\x13\x14\x15\x16\x17\x18\x19\x1a\x1b\x1c\x1d\x1e\x1f")
         self.assertEqual(p.daddr, b"\xD0\xD1\xD2\xD3\xD4\xD5\xD6\xD7\xD8\xD9\xDa\xDb\xDc\xDd\xDe\xDf")
 
+    def test_hdr(self):
+        p = APv6Packet(hdr=0xD3, hops=42)
+        b = bytes(p)
+        self.assertEqual(b, b"\xD3\x2A")
+        p = APv6Packet.parse(b)
+        self.assertEqual(p.hdr, b"\xD3")
+        self.assertEqual(p.hops, b"\x2A")
+
+    def test_nhc(self):
+        p = APv6Packet(nhc=1)
+        self.assertEqual(p.nhc, 1)
+        b = bytes(p)
+        self.assertEqual(b, b"\xD7")
+        p = APv6Packet.parse(b)
+        self.assertEqual(p.hdr, b"\xD7")
+
+    def test_payld(self):
+        p = APv6Packet(payld=b"\x01\x02\x03")
+        b = bytes(p)
+        self.assertEqual(b, b"\xD7\x01\x02\x03")
+        p = APv6Packet.parse(b)
+        self.assertEqual(p.hdr, b"\xD7")
+        self.assertEqual(p.payld, b"\x01\x02\x03")
+
+    def test_invalid_field(self):
+        with self.assertRaises(APv6PacketError):
+            APv6Packet(ttl=1)
+
+    def test_parse_not_bytes(self):
+        with self.assertRaises(APv6PacketError):
+            APv6Packet.parse([0xD7, 256])
+        with self.assertRaises(APv6PacketError):
+            APv6Packet.parse(b"")
+
 
 if __name__ == "__main__":
     unittest.main()